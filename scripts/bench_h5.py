@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import cache_csv
+import calc_h5
+
+# Benchmark do pipeline de calc_h5 com dados sintéticos.
+#
+# Gera CSVs nos tres formatos aceitos por carrega_csv (padrão PP, .OA. e
+# .OA-lite.) com citações de cauda longa e uma taxa de duplicatas
+# configurável, e mede cada fase de run_h5_script:
+#   load    -> carrega_csv (sem cache_csv)
+#   year    -> conversão da coluna Year
+#   dedup   -> remover_repetidos
+#   filter  -> filtrar_periodo
+#   hindex  -> calcular_metricas_h
+# Para cada fase: melhor tempo, vazão (artigos/s) e pico de memória
+# (tracemalloc, medido numa passada separada para não distorcer o tempo).
+#
+# Exemplos:
+#   python3 bench_h5.py                                   # 10^3..10^6 artigos
+#   python3 bench_h5.py --tamanhos 1000,10000000          # até 10^7
+#   python3 bench_h5.py --salvar-baseline bench.json      # grava baseline
+#   python3 bench_h5.py --baseline bench.json             # compara (exit 1 se regrediu)
+
+FORMATOS = ["pp", "oa", "oa-lite"]
+FASES = ["load", "year", "dedup", "filter", "hindex"]
+ANO_REF = 2025
+
+def _nome_arquivo(formato):
+    if formato == "pp":
+        return "BENCH_2018_2024_PPCR_2025_09.csv"
+    if formato == "oa":
+        return "BENCH_2018_2024_OA_2025_09.OA.csv"
+    return "BENCH_2018_2024_OA_2025_09.OA-lite.csv"
+
+def gerar_dados(pasta, num_papers, formato, taxa_duplicatas=0.05, seed=42):
+    # escreve um CSV sintético com num_papers linhas e retorna o caminho
+    rng = np.random.default_rng(seed)
+    num_unicos = max(1, int(num_papers * (1 - taxa_duplicatas)))
+
+    # citações de cauda longa: maioria com 0-2, poucos com centenas
+    cites = np.floor(rng.pareto(1.3, num_unicos) * 2).astype(np.int64)
+    anos = rng.integers(2017, 2025, num_unicos)
+    ids = np.arange(num_unicos)
+    titulos = pd.Series(ids).map(lambda i: f"Synthetic paper number {i} on heuristics for problem {i % 97}")
+    dois = pd.Series(ids).map(lambda i: f"https://doi.org/10.5555/bench.{i}")
+    autores = pd.Series(ids % 1000).map(lambda i: f"Author {i} | Author {i + 1}")
+
+    # duplicatas: repete registros com título em outra caixa e citações diferentes
+    num_dup = num_papers - num_unicos
+    if num_dup > 0:
+        origem = rng.integers(0, num_unicos, num_dup)
+        cites = np.concatenate([cites, np.maximum(cites[origem] - rng.integers(0, 3, num_dup), 0)])
+        anos = np.concatenate([anos, anos[origem]])
+        titulos = pd.concat([titulos, titulos.iloc[origem].str.upper()], ignore_index=True)
+        dois = pd.concat([dois, dois.iloc[origem]], ignore_index=True)
+        autores = pd.concat([autores, autores.iloc[origem]], ignore_index=True)
+
+    if formato == "pp":
+        df = pd.DataFrame({
+            "Cites": cites,
+            "Authors": autores.str.replace(" | ", ", ", regex=False),
+            "Title": titulos,
+            "Year": anos,
+            "Source": "Synthetic Proceedings",
+            "Publisher": "Bench",
+            "DOI": dois.str.replace("https://doi.org/", "", regex=False),
+        })
+    else:
+        df = pd.DataFrame({
+            "cited_by_count": cites,
+            "publication_year": anos,
+            "title": titulos,
+            "display_name": titulos,
+            "primary_location.source.display_name": "Synthetic Proceedings",
+            "primary_location.source.host_organization_name": "Bench",
+            "doi": dois,
+            "ids.doi": dois,
+            "authorships.author.display_name": autores,
+            "authorships.raw_author_name": autores,
+        })
+        if formato == "oa":
+            # dump completo do OpenAlex tem muitas outras colunas
+            df["id"] = "https://openalex.org/W" + pd.Series(np.arange(len(df))).astype(str)
+            df["type"] = "proceedings-article"
+
+    caminho = os.path.join(pasta, _nome_arquivo(formato))
+    df.to_csv(caminho, index=False)
+    return caminho
+
+def _pipeline(caminho, mede):
+    # roda as fases de run_h5_script em sequência; mede(fase, funcao) executa e mede cada uma
+    ANO_INICIO = ANO_REF - 5
+    ANO_FIM = ANO_REF - 1
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        df = mede("load", lambda: calc_h5.carrega_csv(caminho))
+        df["Year"] = mede("year", lambda: pd.to_numeric(df["Year"], errors="coerce").fillna(ANO_INICIO - 1).astype(int))
+        df["Fontes"] = "|".join(calc_h5.detectar_fonte(caminho))
+        df = mede("dedup", lambda: calc_h5.remover_repetidos(df))
+        _, citacoes, _, _ = mede("filter", lambda: calc_h5.filtrar_periodo(df, ANO_INICIO, ANO_FIM))
+        mede("hindex", lambda: calc_h5.calcular_metricas_h(citacoes))
+
+def _tempos(caminho):
+    # segundos por fase
+    tempos = {}
+    def mede(fase, funcao):
+        t0 = time.perf_counter()
+        saida = funcao()
+        tempos[fase] = time.perf_counter() - t0
+        return saida
+    _pipeline(caminho, mede)
+    return tempos
+
+def _picos_memoria(caminho):
+    # pico de memória por fase (MB), numa passada com tracemalloc
+    picos = {}
+    def mede(fase, funcao):
+        tracemalloc.reset_peak()
+        saida = funcao()
+        picos[fase] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        return saida
+    tracemalloc.start()
+    try:
+        _pipeline(caminho, mede)
+    finally:
+        tracemalloc.stop()
+    return picos
+
+def executar(tamanhos, formatos, taxa_duplicatas, repeticoes, memoria):
+    resultados = []
+    # o benchmark mede o parse do CSV, não o cache
+    cache_csv.ATIVO = False
+    with tempfile.TemporaryDirectory(prefix="bench_h5_") as pasta:
+        for n in tamanhos:
+            for formato in formatos:
+                caminho = gerar_dados(pasta, n, formato, taxa_duplicatas)
+                melhores = {}
+                for _ in range(repeticoes):
+                    for fase, t in _tempos(caminho).items():
+                        melhores[fase] = min(t, melhores.get(fase, t))
+                picos = _picos_memoria(caminho) if memoria else {}
+                for fase in FASES:
+                    resultados.append({
+                        "formato": formato,
+                        "papers": n,
+                        "fase": fase,
+                        "segundos": melhores[fase],
+                        "papers_por_segundo": n / melhores[fase] if melhores[fase] > 0 else None,
+                        "pico_mb": picos.get(fase),
+                    })
+                    r = resultados[-1]
+                    pico = f"{r['pico_mb']:9.1f} MB" if r["pico_mb"] is not None else ""
+                    print(f"{formato:8s} {n:>10d} {fase:7s} {r['segundos']*1000:10.2f} ms {r['papers_por_segundo'] or 0:14.0f} papers/s {pico}")
+                os.remove(caminho)
+    return resultados
+
+def comparar(resultados, baseline, tolerancia):
+    # retorna a lista de (formato, papers, fase, atual, baseline) mais lentos que baseline*(1+tolerancia)
+    referencia = {(b["formato"], b["papers"], b["fase"]): b["segundos"] for b in baseline["resultados"]}
+    regressoes = []
+    for r in resultados:
+        base = referencia.get((r["formato"], r["papers"], r["fase"]))
+        if base is not None and r["segundos"] > base * (1 + tolerancia):
+            regressoes.append((r["formato"], r["papers"], r["fase"], r["segundos"], base))
+    return regressoes
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline calc_h5 com dados sintéticos")
+    parser.add_argument("--tamanhos", default="1000,10000,100000,1000000",
+                        help="numeros de artigos, separados por virgula (default: %(default)s)")
+    parser.add_argument("--formatos", default=",".join(FORMATOS),
+                        help="formatos de CSV: pp, oa, oa-lite (default: %(default)s)")
+    parser.add_argument("--duplicatas", type=float, default=0.05, help="taxa de duplicatas (default: %(default)s)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="repetições por caso; vale o melhor tempo")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede pico de memória")
+    parser.add_argument("--saida", help="grava os resultados em JSON")
+    parser.add_argument("--salvar-baseline", help="grava os resultados como baseline em JSON")
+    parser.add_argument("--baseline", help="compara com um baseline salvo anteriormente")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="fração de lentidão aceita antes de acusar regressão (default: %(default)s)")
+    args = parser.parse_args(argv[1:])
+
+    tamanhos = [int(float(t)) for t in args.tamanhos.split(",")]
+    formatos = args.formatos.split(",")
+    print(f"{'formato':8s} {'papers':>10s} {'fase':7s} {'tempo':>13s} {'vazao':>23s} {'pico':>12s}")
+    resultados = executar(tamanhos, formatos, args.duplicatas, args.repeticoes, not args.sem_memoria)
+
+    relatorio = {
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "duplicatas": args.duplicatas,
+        "resultados": resultados,
+    }
+    for destino in (args.saida, args.salvar_baseline):
+        if destino:
+            with open(destino, "w", encoding="utf-8") as f:
+                json.dump(relatorio, f, indent=2)
+            print(f"Resultados gravados em {destino}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressoes = comparar(resultados, baseline, args.tolerancia)
+        if regressoes:
+            print(f"REGRESSAO em relação a {args.baseline} (tolerancia {args.tolerancia:.0%}):")
+            for formato, n, fase, atual, base in regressoes:
+                print(f"  {formato} {n} {fase}: {atual*1000:.2f} ms (baseline {base*1000:.2f} ms, +{(atual/base-1):.0%})")
+            return 1
+        print(f"Sem regressões em relação a {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
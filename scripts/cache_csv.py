@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sys
+import pandas as pd
+
+# Cache persistente dos CSVs já normalizados por calc_h5.carrega_csv.
+#
+# Cada arquivo de dados vira uma entrada em CSV_CACHE_DIR:
+# - <chave>.pkl: dataframe normalizado (Title/Cites/Authors/Year/Source/Publisher/DOI)
+#   em pickle binario, que o pandas recarrega sem parse de texto
+# - <chave>.json: caminho, tamanho, mtime, sha256 e versao do leitor
+#
+# Uma entrada vale se caminho, tamanho e mtime batem; se só o mtime mudou
+# (ex: git checkout), o sha256 do conteúdo decide. O mtime do .pkl marca o
+# ultimo acesso, e as entradas mais antigas saem quando o total passa de
+# LIMITE_BYTES.
+#
+# Uso: python3 cache_csv.py [status | invalidar [arquivos...]]
+
+CACHE_DIR = os.environ.get("CSCONFS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+CSV_CACHE_DIR = os.path.join(CACHE_DIR, "csv")
+LIMITE_BYTES = int(os.environ.get("CSCONFS_CSV_CACHE_MB", "512")) * 1024 * 1024
+ATIVO = os.environ.get("CSCONFS_CSV_CACHE", "1") != "0"
+
+def digest_arquivo(caminho):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def _entrada(caminho):
+    chave = hashlib.sha1(os.path.abspath(caminho).encode("utf-8")).hexdigest()
+    base = os.path.join(CSV_CACHE_DIR, chave)
+    return base + ".pkl", base + ".json"
+
+def _escreve_atomico(destino, escreve):
+    tmp = f"{destino}.{os.getpid()}.tmp"
+    escreve(tmp)
+    os.replace(tmp, destino)
+
+def _escreve_meta(arq_meta, meta):
+    def escreve(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    _escreve_atomico(arq_meta, escreve)
+
+def ler(caminho, versao):
+    # retorna o dataframe em cache, ou None se ausente/desatualizado
+    if not ATIVO:
+        return None
+    arq_pkl, arq_meta = _entrada(caminho)
+    try:
+        with open(arq_meta, encoding="utf-8") as f:
+            meta = json.load(f)
+        st = os.stat(caminho)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("caminho") != os.path.abspath(caminho) or meta.get("versao") != versao:
+        return None
+    if meta.get("tamanho") != st.st_size:
+        return None
+    if meta.get("mtime_ns") != st.st_mtime_ns:
+        # mesmo tamanho, mtime diferente: confere o conteúdo
+        if meta.get("sha256") != digest_arquivo(caminho):
+            return None
+        meta["mtime_ns"] = st.st_mtime_ns
+        _escreve_meta(arq_meta, meta)
+
+    try:
+        df = pd.read_pickle(arq_pkl)
+        os.utime(arq_pkl)  # marca acesso recente (LRU)
+    except (OSError, ValueError, EOFError):
+        return None
+    return df
+
+def gravar(caminho, versao, df, stat=None):
+    # stat: os.stat do arquivo obtido ANTES do parse (evita cachear versão errada)
+    if not ATIVO:
+        return
+    os.makedirs(CSV_CACHE_DIR, exist_ok=True)
+    st = stat if stat is not None else os.stat(caminho)
+    arq_pkl, arq_meta = _entrada(caminho)
+
+    _escreve_atomico(arq_pkl, lambda tmp: df.to_pickle(tmp, protocol=5))
+    _escreve_meta(arq_meta, {
+        "caminho": os.path.abspath(caminho),
+        "tamanho": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest_arquivo(caminho),
+        "versao": versao,
+    })
+    aplicar_limite()
+
+def _entradas():
+    if not os.path.isdir(CSV_CACHE_DIR):
+        return []
+    entradas = []
+    for nome in os.listdir(CSV_CACHE_DIR):
+        if nome.endswith(".pkl"):
+            arq_pkl = os.path.join(CSV_CACHE_DIR, nome)
+            try:
+                st = os.stat(arq_pkl)
+            except OSError:
+                continue
+            entradas.append((st.st_mtime, st.st_size, arq_pkl))
+    return entradas
+
+def _remove_entrada(arq_pkl):
+    for arq in (arq_pkl, arq_pkl[:-len(".pkl")] + ".json"):
+        try:
+            os.remove(arq)
+        except FileNotFoundError:
+            pass
+
+def aplicar_limite(limite=None):
+    # remove as entradas acessadas há mais tempo até caber no limite
+    limite = LIMITE_BYTES if limite is None else limite
+    entradas = sorted(_entradas())
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    removidas = 0
+    for _, tamanho, arq_pkl in entradas:
+        if total <= limite:
+            break
+        _remove_entrada(arq_pkl)
+        total -= tamanho
+        removidas += 1
+    return removidas
+
+def invalidar(caminhos=None):
+    # sem caminhos, invalida o cache inteiro; retorna o numero de entradas removidas
+    if caminhos is None:
+        alvos = [arq_pkl for _, _, arq_pkl in _entradas()]
+    else:
+        alvos = [_entrada(c)[0] for c in caminhos]
+    removidas = 0
+    for arq_pkl in alvos:
+        if os.path.exists(arq_pkl):
+            removidas += 1
+        _remove_entrada(arq_pkl)
+    return removidas
+
+def main(argv):
+    comando = argv[1] if len(argv) > 1 else "status"
+    if comando == "status":
+        entradas = _entradas()
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        print(f"CSV_CACHE_DIR = {CSV_CACHE_DIR}")
+        print(f"Entradas = {len(entradas)}, Tamanho = {total/1024/1024:.1f} MB, Limite = {LIMITE_BYTES/1024/1024:.0f} MB")
+    elif comando == "invalidar":
+        removidas = invalidar(argv[2:] or None)
+        print(f"Entradas removidas: {removidas}")
+    else:
+        print(f"Usage: python3 {os.path.basename(argv[0])} [status | invalidar [arquivos...]]")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
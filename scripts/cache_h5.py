@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+import glob
+import hashlib
+import json
+import os
+import sys
+import calc_h5
+from cache_csv import CACHE_DIR, digest_arquivo
+from instrumentacao import info
+
+# Memoização em disco dos resultados de run_h5_script.
+#
+# Cada (ANO_REF, SIGLA, PACOTE) vira um arquivo em H5_CACHE_DIR com o
+# resultado (h5, h5_med, total_citacoes, num_papers, fontes) e a assinatura
+# das entradas: sha256 de cada CSV do evento e versão do código que calcula
+# o h5 (calc_h5.py, metricas.py, vinculo.py e opção de quase-duplicatas).
+# Qualquer mudança nas entradas recalcula só aquele evento.
+#
+# Uso: python3 cache_h5.py [status | invalidar]
+
+H5_CACHE_DIR = os.path.join(CACHE_DIR, "h5")
+ARQUIVOS_CODIGO = ["calc_h5.py", "metricas.py", "vinculo.py"]
+
+_versao_codigo = None
+
+def versao_codigo():
+    global _versao_codigo
+    if _versao_codigo is None:
+        h = hashlib.sha256()
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        for nome in ARQUIVOS_CODIGO:
+            h.update(nome.encode("utf-8"))
+            h.update(digest_arquivo(os.path.join(pasta, nome)).encode("utf-8"))
+        h.update(f"quase_duplicatas={calc_h5.QUASE_DUPLICATAS}".encode("utf-8"))
+        _versao_codigo = h.hexdigest()
+    return _versao_codigo
+
+def _arquivo_entrada(ANO_REF, SIGLA, PACOTE):
+    chave = hashlib.sha1(f"{ANO_REF}|{SIGLA}|{PACOTE}".encode("utf-8")).hexdigest()
+    return os.path.join(H5_CACHE_DIR, chave + ".json")
+
+def _estado_entradas(SIGLA, PACOTE, anterior):
+    # lista [caminho, tamanho, mtime_ns, sha256] dos CSVs lidos por run_h5_script;
+    # reaproveita o sha256 anterior quando tamanho e mtime não mudaram
+    DATA_DIR = f'../data/{SIGLA}/{PACOTE}/'
+    conhecidos = {e[0]: e for e in anterior}
+    estado = []
+    for caminho in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv"))):
+        st = os.stat(caminho)
+        e = conhecidos.get(caminho)
+        if e is not None and e[1] == st.st_size and e[2] == st.st_mtime_ns:
+            sha = e[3]
+        else:
+            sha = digest_arquivo(caminho)
+        estado.append([caminho, st.st_size, st.st_mtime_ns, sha])
+    return estado
+
+def ler(ANO_REF, SIGLA, PACOTE):
+    # retorna (resultado ou None, estado das entradas para gravar depois)
+    arq = _arquivo_entrada(ANO_REF, SIGLA, PACOTE)
+    try:
+        with open(arq, encoding="utf-8") as f:
+            memo = json.load(f)
+    except (OSError, ValueError):
+        memo = {}
+
+    estado = _estado_entradas(SIGLA, PACOTE, memo.get("entradas", []))
+    if memo.get("versao_codigo") != versao_codigo():
+        return None, estado
+    # compara só caminho e sha256 (mtime pode mudar sem mudar o conteúdo)
+    if [(e[0], e[3]) for e in estado] != [(e[0], e[3]) for e in memo.get("entradas", [])]:
+        return None, estado
+
+    h5_total, h5_med_total, total_citacoes, num_papers_total, fontes = memo["resultado"]
+    return (h5_total, h5_med_total, total_citacoes, num_papers_total, fontes), estado
+
+def gravar(ANO_REF, SIGLA, PACOTE, estado, resultado):
+    os.makedirs(H5_CACHE_DIR, exist_ok=True)
+    arq = _arquivo_entrada(ANO_REF, SIGLA, PACOTE)
+    tmp = f"{arq}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "ano_ref": ANO_REF,
+            "sigla": SIGLA,
+            "pacote": PACOTE,
+            "versao_codigo": versao_codigo(),
+            "entradas": estado,
+            "resultado": list(resultado),
+        }, f, ensure_ascii=False)
+    os.replace(tmp, arq)
+
+# Mesmo contrato de calc_h5.run_h5_paralelo, mas só calcula os eventos cujas
+# entradas (ou código) mudaram desde o último cálculo.
+def run_h5_paralelo_memo(ANO_REF, SIGLAS, PACOTE, max_workers=None):
+    resultados = {}
+    estados = {}
+    pendentes = []
+    for sigla in dict.fromkeys(SIGLAS):
+        resultado, estado = ler(ANO_REF, sigla, PACOTE)
+        if resultado is None:
+            pendentes.append(sigla)
+            estados[sigla] = estado
+        else:
+            info(f"calc_h5.py => CACHE run_h5_script({ANO_REF},{sigla},{PACOTE}): H5 = {resultado[0]}")
+            resultados[sigla] = resultado
+
+    novos, erros = calc_h5.run_h5_paralelo(ANO_REF, pendentes, PACOTE, max_workers) if pendentes else ({}, {})
+    for sigla, resultado in novos.items():
+        gravar(ANO_REF, sigla, PACOTE, estados[sigla], resultado)
+        resultados[sigla] = resultado
+
+    # mantém a ordem de SIGLAS
+    resultados = {sigla: resultados[sigla] for sigla in dict.fromkeys(SIGLAS) if sigla in resultados}
+    return resultados, erros
+
+def main(argv):
+    comando = argv[1] if len(argv) > 1 else "status"
+    arquivos = glob.glob(os.path.join(H5_CACHE_DIR, "*.json"))
+    if comando == "status":
+        print(f"H5_CACHE_DIR = {H5_CACHE_DIR}")
+        print(f"Entradas = {len(arquivos)}")
+    elif comando == "invalidar":
+        for arq in arquivos:
+            os.remove(arq)
+        print(f"Entradas removidas: {len(arquivos)}")
+    else:
+        print(f"Usage: python3 {os.path.basename(argv[0])} [status | invalidar]")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,24 +1,14 @@
 import pandas as pd
+import numpy as np
 import os
-import statistics
+import io
 import glob
-
-# função recebe LISTA DE CITAÇÕES, numérica, e retorna h-index
-def calcular_h_index(citacoes):
-    citacoes = sorted(citacoes, reverse=True)
-    h = 0
-    for i, c in enumerate(citacoes, start=1):
-        if c >= i:
-            h = i
-        else:
-            break
-    if h > 0:
-        # print("hr_med list = ", citacoes[:h])
-        h5_median = statistics.median(citacoes[:h])
-    else:
-        h5_median = 0
-    
-    return h, h5_median
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import cache_csv
+import vinculo
+from instrumentacao import debug, erro, fase, info
+from metricas import calcular_h_index, calcular_metricas_h, calcular_metricas_h_lote, detectar_fonte
 
 def carregar_csv_padrao(caminho):
     df = pd.read_csv(caminho)
@@ -54,175 +44,297 @@ def carregar_openalex_csv(caminho):
 
     return df_conv
 
+# incrementar ao mudar a normalização de carregar_csv_padrao/carregar_openalex_csv
+# (invalida as entradas do cache_csv)
+VERSAO_LEITORES = 1
+
 def carrega_csv(caminho):
+    df = cache_csv.ler(caminho, VERSAO_LEITORES)
+    if df is not None:
+        debug(f"Processando {caminho}... [cache]")
+        return df
+
+    stat = os.stat(caminho)
     if ".OA." in os.path.basename(caminho):
-        print(f"Processando {caminho}... [CSV OpenAlex]")
-        return carregar_openalex_csv(caminho)
+        debug(f"Processando {caminho}... [CSV OpenAlex]")
+        df = carregar_openalex_csv(caminho)
     elif ".OA-lite." in os.path.basename(caminho):
-        print(f"Processando {caminho}... [CSV OpenAlex LITE]")
-        return carregar_openalex_csv(caminho)
+        debug(f"Processando {caminho}... [CSV OpenAlex LITE]")
+        df = carregar_openalex_csv(caminho)
     else:
-        print(f"Processando {caminho}... [CSV Padrão]")
-        return carregar_csv_padrao(caminho)
-    
-def detectar_fonte(arq):
-    # fontes disponíveis:
-    # OA: OpenAlex
-    # GS: Google Scholar
-    # CR: Crossref
-    # PPXX, onde XX é uma coleta via Publish or Perish do tipo XX
-    # MAXX, onde XX é uma coleta MANUAL do tipo XX
-    #
-    # exemplos: 
-    # - OA: coleta via OpenAlex em formato CSV padrão
-    # - PPCR: coleta do crossref via publish or perish em formato CSV padrão
-    # - MAGS.OA: coleta manual no google scholar em formato CSV OpenAlex
-    #
-    fontes = []
-    if "_PPCR_" in arq:
-        fontes.append("CR")
-    if ".OA." in arq or "_OA_" in arq or "_PPOA_" in arq:
-        fontes.append("OA")
-    if "_PPGS_" in arq or "_MAGS_" in arq:
-        fontes.append("GS")
-    return fontes
+        debug(f"Processando {caminho}... [CSV Padrão]")
+        df = carregar_csv_padrao(caminho)
 
-def run_h5_script(ANO_REF, SIGLA, PACOTE):
-    print(f"calc_h5.py => BEGIN run_h5_script({ANO_REF},{SIGLA},{PACOTE})")
-    ANO_INICIO = ANO_REF-5
-    ANO_FIM = ANO_REF-1
-    print(f"Ano Referencia = {ANO_REF}, Ano Inicio = {ANO_INICIO}, Ano Fim = {ANO_FIM}")
+    cache_csv.gravar(caminho, VERSAO_LEITORES, df, stat)
+    return df
 
-    DEBUG=False
-    DATA_DIR = f'../data/{SIGLA}/{PACOTE}/'
+# filtra o dataframe pelo periodo [ano_inicio, ano_fim] usando mascaras por coluna
+# retorna (df_ano, citacoes positivas do periodo, ano_min, ano_max)
+def filtrar_periodo(df, ano_inicio, ano_fim):
+    anos = df["Year"].to_numpy()
+    if len(anos) == 0:
+        return df, np.zeros(0, dtype=np.int64), +9999999, 0
+    ano_min = int(anos.min())
+    ano_max = int(anos.max())
+
+    no_periodo = (anos >= ano_inicio) & (anos <= ano_fim)
+    cites = df["Cites"].fillna(0).to_numpy().astype(np.int64)
+    # minimo de 1 citação para contribuir no fator H
+    citacoes = cites[no_periodo & (cites > 0)]
+
+    return df[no_periodo], citacoes, ano_min, ano_max
+
+# liga também títulos quase iguais (MinHash/LSH), além de DOI e título normalizado
+QUASE_DUPLICATAS = os.environ.get("CSCONFS_QUASE_DUPLICATAS", "0") == "1"
+
+# remove artigos repetidos (mesmo DOI, mesmo título normalizado ou, opcionalmente,
+# título quase igual), mantendo o maior numero de citacoes e as fontes de todos
+def remover_repetidos(df, DEBUG=False):
+    if len(df) == 0:
+        return df
+    grupos = vinculo.agrupar_registros(df["DOI"], df["Title"], QUASE_DUPLICATAS)
+    num_count1 = len(df)
+    num_count2 = int(grupos.max()) + 1
+    if num_count1 == num_count2:
+        return df
 
-    # coleta arquivos CSV automaticamente, exceto os 'ignored/'
-    arquivos = glob.glob(os.path.join(DATA_DIR, "*.csv"))
+    # DOI vazio não deve ser escolhido como "first"
+    df = df.assign(DOI=df["DOI"].replace("", np.nan))
+    colunas = {"Title": "first", "Cites": "max", "Authors": "first", "Year": "first",
+               "Source": "first", "Publisher": "first", "DOI": "first"}
+    agregado = df.groupby(grupos, sort=True).agg({c: f for c, f in colunas.items() if c in df})
+    if "Fontes" in df:
+        # fontes que contribuíram para cada artigo: cada fonte vira um bit
+        # e a união do grupo é o OU dos bits
+        codigos, combinacoes = pd.factorize(df["Fontes"])
+        siglas_fontes = sorted({f for c in combinacoes for f in c.split("|") if f})
+        bits_combinacao = np.array([sum(1 << siglas_fontes.index(f) for f in c.split("|") if f) for c in combinacoes], dtype=np.int64)
+        bits = np.zeros(num_count2, dtype=np.int64)
+        np.bitwise_or.at(bits, grupos, bits_combinacao[codigos])
+        nomes = {b: "|".join(f for i, f in enumerate(siglas_fontes) if b >> i & 1) for b in np.unique(bits)}
+        agregado["Fontes"] = [nomes[b] for b in bits]
+    df = agregado.reset_index(drop=True)
+
+    if DEBUG:
+        print(df)
+    debug(f"WARNING: removidos {num_count1-num_count2} elementos num_count1={num_count1} num_count2={num_count2}")
+    return df
+
+# coleta arquivos CSV automaticamente, exceto os 'ignored/'
+def listar_arquivos(SIGLA, PACOTE):
+    DATA_DIR = f'../data/{SIGLA}/{PACOTE}/'
+    arquivos = sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))
 
     fontes = []
-    print("Arquivos encontrados:")
+    debug("Arquivos encontrados:")
     for arq in arquivos:
         fs = detectar_fonte(arq)
         fontes += fs
-        print(" -", arq, "\tfontes: ", fs)
-    # sem repetições...
-    fontes = list(set(fontes))
-    
-    print("Fontes: ", fontes)
+        debug(" -", arq, "\tfontes: ", fs)
+    # sem repetições, em ordem fixa (resultado não depende da ordem do sistema de arquivos)
+    fontes = sorted(set(fontes))
+
+    debug("Fontes: ", fontes)
+    return arquivos, fontes
+
+# carrega um arquivo, normaliza o ano e remove repetidos
+# retorna None para arquivos que não são de artigos (confseries)
+def preparar_arquivo(arq, ano_sem_data, DEBUG=False):
+    if arq.endswith(".confseries.csv"):
+        debug(f"⚠ Ignorando {arq} (confseries)")
+        return None
+
+    with fase("load", arquivo=arq) as f:
+        df_temp = carrega_csv(arq)
+        f.conta(linhas=len(df_temp))
+
+    if DEBUG:
+        print(df_temp.head(10))
+
+    # ignorando campos sem Year... colocando ano_sem_data (fora do periodo)
+    df_temp["Year"] = pd.to_numeric(df_temp["Year"], errors="coerce").fillna(ano_sem_data).astype(int)
+    df_temp["Fontes"] = "|".join(detectar_fonte(arq))
+
+    with fase("dedup", arquivo=arq, linhas_entrada=len(df_temp)) as f:
+        df_temp = remover_repetidos(df_temp)
+        f.conta(linhas_saida=len(df_temp))
+    return df_temp
+
+def run_h5_script(ANO_REF, SIGLA, PACOTE):
+    with fase("run_h5_script", ano_ref=ANO_REF, sigla=SIGLA, pacote=PACOTE) as f:
+        resultado = _run_h5_script(ANO_REF, SIGLA, PACOTE)
+        f.conta(h5=resultado[0], linhas=resultado[3])
+    return resultado
+
+def _run_h5_script(ANO_REF, SIGLA, PACOTE):
+    info(f"calc_h5.py => BEGIN run_h5_script({ANO_REF},{SIGLA},{PACOTE})")
+    ANO_INICIO = ANO_REF-5
+    ANO_FIM = ANO_REF-1
+    info(f"Ano Referencia = {ANO_REF}, Ano Inicio = {ANO_INICIO}, Ano Fim = {ANO_FIM}")
+
+    DEBUG=False
 
+    arquivos, fontes = listar_arquivos(SIGLA, PACOTE)
 
     # dataframe final agregado para o H5
     dfs = []
 
-    print("=== H-index por arquivo ===")
+    debug("=== H-index por arquivo ===")
     for arq in arquivos:
-        caminho = arq
-
-        if arq.endswith(".confseries.csv"):
-            print(f"⚠ Ignorando {arq} (confseries)")
+        df_temp = preparar_arquivo(arq, ANO_INICIO-1, DEBUG)
+        if df_temp is None:
             continue  # skip this file
 
-        df_temp = carrega_csv(caminho)
-
-        if DEBUG:
-            print(df_temp.head(10))
-
-        # ignorando campos sem Year... colocando ANO_INICIO - 1
-        df_temp["Year"] = pd.to_numeric(df_temp["Year"], errors="coerce").fillna(ANO_INICIO-1).astype(int)
-
-        agrupados = df_temp.groupby("Title").size().reset_index(name="count")
-        removidos = agrupados[agrupados["count"] > 1]
-        if len(removidos) > 0:
-            #print("WARNING: elementos repetidos!")
-            #print(removidos)
-
-            num_count1 = len(df_temp)
-            df_temp = df_temp.groupby("Title", as_index=False).agg({
-                "Cites": "max",
-                "Authors": "first",
-                "Year": "first",
-            })
-            num_count2 = len(df_temp)
-            if num_count1 != num_count2:
-                print(f"WARNING: removidos {num_count1-num_count2} elementos num_count1={num_count1} num_count2={num_count2}")
-
-        ano_min = +9999999
-        ano_max = 0
-        
         # filtra linhas no periodo desejado
-        linhas_filtradas = []
-        for _, row in df_temp.iterrows():
-            ano = int(row["Year"])
-            if ano < ano_min:
-                ano_min = ano
-            if ano > ano_max:
-                ano_max = ano
-            if ano >= ANO_INICIO and ano <= ANO_FIM:
-                linhas_filtradas.append(row)
-        
-        if len(linhas_filtradas) == 0:
-            print(f"H = {0}, Hmed = {0}, Citacoes = {0}, Artigos = {0}, Periodo = [{ano_min}, {ano_max}], Limite = [{ANO_INICIO}, {ANO_FIM}] [ignorado]...")
+        with fase("filter", arquivo=arq, linhas_entrada=len(df_temp)) as f:
+            df_ano, citacoes, ano_min, ano_max = filtrar_periodo(df_temp, ANO_INICIO, ANO_FIM)
+            f.conta(linhas_saida=len(df_ano))
+
+        if len(df_ano) == 0:
+            debug(f"H = {0}, Hmed = {0}, Citacoes = {0}, Artigos = {0}, Periodo = [{ano_min}, {ano_max}], Limite = [{ANO_INICIO}, {ANO_FIM}] [ignorado]...")
             continue
-        else:
-            # print(f"Entradas = {len(linhas_filtradas)}")
-            pass
-        df_ano = pd.DataFrame(linhas_filtradas)
-        dfs.append(df_ano) 
-
-        total_citacoes = 0
-        citacoes = []
-        for valor in df_ano["Cites"].fillna(0):
-            v = int(valor)
-            # minimo de 1 citação para contribuir no fator H
-            if v > 0:     
-                citacoes.append(v)
-                total_citacoes += v
+        dfs.append(df_ano)
+
         if DEBUG:
-            print(f"max_cite = {max(citacoes)}")
+            print(f"max_cite = {citacoes.max() if len(citacoes) else 0}")
             print(citacoes)
-        h5_ano, h5_med_ano = calcular_h_index(citacoes)
+        with fase("hindex", arquivo=arq, linhas=len(citacoes)):
+            h5_ano, h5_med_ano, total_citacoes = calcular_metricas_h(citacoes)
         num_papers = len(df_ano)
-        print(f"H = {h5_ano}, Hmed = {h5_med_ano}, Citacoes = {total_citacoes}, Artigos = {num_papers}, Periodo = [{ano_min}, {ano_max}], Limite = [{ANO_INICIO}, {ANO_FIM}]")
-
+        debug(f"H = {h5_ano}, Hmed = {h5_med_ano}, Citacoes = {total_citacoes}, Artigos = {num_papers}, Periodo = [{ano_min}, {ano_max}], Limite = [{ANO_INICIO}, {ANO_FIM}]")
 
-    print("Processando agregado final...")
-    df = pd.concat(dfs, ignore_index=True)
 
-    # TODO(igormcoelho): fazer função pra isso...
-    agrupados = df.groupby("Title").size().reset_index(name="count")
-    removidos = agrupados[agrupados["count"] > 1]
-    if len(removidos) > 0:
-        # print(f"WARNING: elementos repetidos! DEBUG={DEBUG}")
-        if DEBUG:
-            print(removidos)
-        num_count1 = len(df)
-        df = df.groupby("Title", as_index=False).agg({
-            "Cites": "max",
-            "Authors": "first",
-            "Year": "first",
-        })
-        num_count2 = len(df)
-        if num_count1 != num_count2:
-            print(f"WARNING: removidos {num_count1-num_count2} elementos num_count1={num_count1} num_count2={num_count2}")
-
-    # TODO(igormcoelho): fazer uma função pra isso
-    total_citacoes = 0
-    citacoes = []
-    for valor in df["Cites"].fillna(0):
-        v = int(valor)
-        # minimo de 1 citação para contribuir no fator H
-        if v > 0:     
-            citacoes.append(v)
-            total_citacoes += v
-
-    h5_total, h5_med_total = calcular_h_index(citacoes)
-    num_papers_total = len(df)
-    print(f"=== H5 ({ANO_REF}) ===")
-    print(f"H5 = {h5_total}, H5med = {h5_med_total}, Total Citacoes = {total_citacoes}, Total Artigos = {num_papers_total}")
-    print(f"calc_h5.py => END run_h5_script({ANO_REF},{SIGLA},{PACOTE})")
+    debug("Processando agregado final...")
+    with fase("aggregate", sigla=SIGLA, arquivos=len(dfs)) as f:
+        df = pd.concat(dfs, ignore_index=True)
+        f.conta(linhas_entrada=len(df))
+        df = remover_repetidos(df, DEBUG)
+        h5_total, h5_med_total, total_citacoes = calcular_metricas_h(df["Cites"].fillna(0).to_numpy())
+        num_papers_total = len(df)
+        f.conta(linhas_saida=num_papers_total)
+    info(f"=== H5 ({ANO_REF}) ===")
+    info(f"H5 = {h5_total}, H5med = {h5_med_total}, Total Citacoes = {total_citacoes}, Total Artigos = {num_papers_total}")
+    info(f"calc_h5.py => END run_h5_script({ANO_REF},{SIGLA},{PACOTE})")
     return h5_total, h5_med_total, total_citacoes, num_papers_total, fontes
 
+# Serie historica de h5: carrega os arquivos do evento uma unica vez, ordena
+# por ano e desliza a janela [ANO_REF-5, ANO_REF-1] por todos os ANOS_REF.
+# Retorna (serie, fontes), onde serie[ANO_REF] = (h5, h5_med, total_citacoes, num_papers),
+# os mesmos numeros que run_h5_script(ANO_REF, SIGLA, PACOTE) daria para cada ano.
+def run_h5_serie(ANOS_REF, SIGLA, PACOTE):
+    ANOS_REF = sorted(ANOS_REF)
+    info(f"calc_h5.py => BEGIN run_h5_serie({ANOS_REF[0]}-{ANOS_REF[-1]},{SIGLA},{PACOTE})")
+
+    arquivos, fontes = listar_arquivos(SIGLA, PACOTE)
+
+    # anos sem data ficam antes de qualquer janela
+    ano_sem_data = ANOS_REF[0]-6
+    tabelas = []
+    for arq in arquivos:
+        df_temp = preparar_arquivo(arq, ano_sem_data)
+        if df_temp is None:
+            continue
+        df_temp = df_temp.sort_values("Year", kind="stable", ignore_index=True)
+        tabelas.append((df_temp, df_temp["Year"].to_numpy()))
+
+    citacoes_por_ano = []
+    num_papers_por_ano = []
+    for ANO_REF in ANOS_REF:
+        ANO_INICIO = ANO_REF-5
+        ANO_FIM = ANO_REF-1
+
+        # com os anos ordenados, a janela é uma fatia contigua de cada arquivo
+        dfs = []
+        for df_temp, anos in tabelas:
+            ini = np.searchsorted(anos, ANO_INICIO, side="left")
+            fim = np.searchsorted(anos, ANO_FIM, side="right")
+            if fim > ini:
+                dfs.append(df_temp.iloc[ini:fim])
+
+        if len(dfs) == 0:
+            citacoes_por_ano.append([])
+            num_papers_por_ano.append(0)
+            continue
+        df = remover_repetidos(pd.concat(dfs, ignore_index=True))
+        citacoes_por_ano.append(df["Cites"].fillna(0).to_numpy())
+        num_papers_por_ano.append(len(df))
+
+    # todas as janelas calculadas numa unica chamada
+    resultados = calcular_metricas_h_lote(citacoes_por_ano)
+
+    serie = {}
+    info(f"=== Serie H5 ({SIGLA}) ===")
+    for ANO_REF, (h5, h5_med, total_citacoes), num_papers in zip(ANOS_REF, resultados, num_papers_por_ano):
+        serie[ANO_REF] = (h5, h5_med, total_citacoes, num_papers)
+        info(f"{ANO_REF}: H5 = {h5}, H5med = {h5_med}, Total Citacoes = {total_citacoes}, Total Artigos = {num_papers}")
+    info(f"calc_h5.py => END run_h5_serie({ANOS_REF[0]}-{ANOS_REF[-1]},{SIGLA},{PACOTE})")
+    return serie, fontes
+
+# executa run_h5_script capturando a saida, para nao misturar logs entre processos
+def _run_h5_isolado(args):
+    ANO_REF, SIGLA, PACOTE = args
+    saida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(saida):
+            resultado = run_h5_script(ANO_REF, SIGLA, PACOTE)
+        return resultado, None, saida.getvalue()
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", saida.getvalue()
+
+# roda um evento sozinho num processo novo: se o processo morrer (OOM, segfault),
+# so esse evento falha
+def _run_h5_processo(tarefa):
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_run_h5_isolado, tarefa).result()
+
+# resultado do evento no pool; se o pool quebrou, refaz o evento sozinho
+def _resultado_futuro(futuro, tarefa):
+    try:
+        return futuro.result()
+    except Exception as e:
+        ANO_REF, SIGLA, PACOTE = tarefa
+        info(f"calc_h5.py => WARNING run_h5_script({ANO_REF},{SIGLA},{PACOTE}): {type(e).__name__}: {e} (refazendo sozinho)")
+    try:
+        return _run_h5_processo(tarefa)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", ""
+
+# Calcula o h5 de varios eventos em paralelo (um processo por evento, ate
+# max_workers, por padrao o numero de CPUs). Os logs de cada evento sao
+# impressos inteiros e na ordem de SIGLAS. Falhas ficam isoladas por evento:
+# se um processo morre (BrokenProcessPool), o pool inteiro quebra e os eventos
+# afetados sao refeitos um a um, cada um em seu proprio processo.
+# Retorna (resultados, erros): resultados[SIGLA] = tupla de run_h5_script,
+# erros[SIGLA] = mensagem de erro.
+def run_h5_paralelo(ANO_REF, SIGLAS, PACOTE, max_workers=None):
+    SIGLAS = list(dict.fromkeys(SIGLAS))
+    tarefas = [(ANO_REF, sigla, PACOTE) for sigla in SIGLAS]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(tarefas)))
+
+    resultados = {}
+    erros = {}
+    if max_workers == 1:
+        saidas = map(_run_h5_isolado, tarefas)
+    else:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        futuros = [executor.submit(_run_h5_isolado, tarefa) for tarefa in tarefas]
+        saidas = (_resultado_futuro(futuro, tarefa) for futuro, tarefa in zip(futuros, tarefas))
+    try:
+        for sigla, (resultado, falha, log) in zip(SIGLAS, saidas):
+            print(log, end="")
+            if falha is None:
+                resultados[sigla] = resultado
+            else:
+                erro(f"calc_h5.py => ERROR run_h5_script({ANO_REF},{sigla},{PACOTE}): {falha}")
+                erros[sigla] = falha
+    finally:
+        if max_workers > 1:
+            executor.shutdown(cancel_futures=True)
+    return resultados, erros
+
 if __name__ == '__main__':
-    print(f"github.com/cs-confs-br/cs-confs-br-data: executando script calc_h5.py")
+    info(f"github.com/cs-confs-br/cs-confs-br-data: executando script calc_h5.py")
     h5_total, h5_med_total, total_citacoes, num_papers_total, fontes = run_h5_script(2025, 'ICVNS', '2025_09')
-    print("Fontes utilizadas:", fontes)
\ No newline at end of file
+    info("Fontes utilizadas:", fontes)
\ No newline at end of file
@@ -0,0 +1,100 @@
+# Discovery of the chapter range of a proceedings volume, used by the
+# OpenAlex and Springer fetchers (fetch_proceedings.py). Chapters are DOIs
+# {base_doi}_{suffix}, numbered from FirstPaper to LastPaper.
+#
+# With both FirstPaper and LastPaper in the .confseries.csv no request is
+# made. Otherwise the last chapter is found by galloping: probe first+1,
+# first+2, first+4, ... until a miss, then binary search between the last hit
+# and the miss, O(log n) probes instead of one per chapter. A position counts
+# as a hit if it or one of the next MAX_GAP suffixes exists, so isolated
+# missing chapters do not end the volume early.
+#
+# The search is a generator that yields the suffixes to probe and receives
+# True/False, so the same code runs with blocking (find_last_chapter) and
+# asyncio (find_last_chapter_async) probes. A probe returns None when it could
+# not tell (request failed): that raises ProbeError instead of counting as a
+# missing chapter, which would cut the range short.
+
+MAX_GAP = 2
+MAX_CHAPTERS = 999
+
+class ProbeError(Exception):
+    pass
+
+def _search_last(first, max_gap, limit):
+    known = {}
+
+    def exists(suffix):
+        if suffix > limit:
+            return False
+        if suffix not in known:
+            found = yield suffix
+            if found is None:
+                raise ProbeError(f"could not tell whether chapter {suffix} exists")
+            known[suffix] = bool(found)
+        return known[suffix]
+
+    def near(suffix):
+        for k in range(max_gap + 1):
+            if (yield from exists(suffix + k)):
+                return True
+        return False
+
+    if not (yield from near(first)):
+        return None
+    lo = first  # near(lo) holds
+    step = 1
+    while (yield from near(lo + step)):
+        lo += step
+        step *= 2
+    hi = lo + step  # near(hi) fails
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if (yield from near(mid)):
+            lo = mid
+        else:
+            hi = mid
+    # near(lo) holds and lo+1..lo+1+max_gap are all missing, so lo is the last chapter
+    return lo
+
+def find_last_chapter(probe, first=1, max_gap=MAX_GAP, limit=MAX_CHAPTERS):
+    # probe(suffix) -> True/False if the chapter exists or not, None if unknown (ProbeError);
+    # returns None if there is no chapter from first on
+    search = _search_last(first, max_gap, limit)
+    try:
+        suffix = next(search)
+        while True:
+            suffix = search.send(probe(suffix))
+    except StopIteration as stop:
+        return stop.value
+
+async def find_last_chapter_async(probe, first=1, max_gap=MAX_GAP, limit=MAX_CHAPTERS):
+    # same as find_last_chapter, with a coroutine probe
+    search = _search_last(first, max_gap, limit)
+    try:
+        suffix = next(search)
+        while True:
+            suffix = search.send(await probe(suffix))
+    except StopIteration as stop:
+        return stop.value
+
+def hinted_range(first_hint, last_hint):
+    # FirstPaper/LastPaper values of a .confseries.csv row (None/NaN/'' when absent)
+    def as_int(value):
+        if value is None or value != value or str(value).strip() == "":
+            return None
+        return int(float(value))
+    return as_int(first_hint) or 1, as_int(last_hint)
+
+def chapter_range(probe, first_hint=None, last_hint=None, max_gap=MAX_GAP, limit=MAX_CHAPTERS):
+    # (first, last) chapter suffixes of a volume, or None if it has no chapters
+    first, last = hinted_range(first_hint, last_hint)
+    if last is None:
+        last = find_last_chapter(probe, first, max_gap, limit)
+    return None if last is None else (first, last)
+
+async def chapter_range_async(probe, first_hint=None, last_hint=None, max_gap=MAX_GAP, limit=MAX_CHAPTERS):
+    first, last = hinted_range(first_hint, last_hint)
+    if last is None:
+        last = await find_last_chapter_async(probe, first, max_gap, limit)
+    return None if last is None else (first, last)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import os
+import re
+import sqlite3
+import pandas as pd
+
+# SQLite export of the normalized catalog (out/conferences.db).
+#
+# Writes conferences, conference_editions and conference_additional_names with
+# the same columns as the CSVs, plus the h5 results of out/website-<year>.csv
+# (h5_results), indexed on cs_id and acronym. Conference acronyms (primary and
+# additional) compare case-insensitively, so WHERE acronym = 'sbbd' uses the index. conference_search is an FTS5 index
+# over names and acronyms, including the additional ones:
+#   SELECT DISTINCT cs_id FROM conference_search WHERE conference_search MATCH 'recommender';
+# Views:
+#   conference_lookup  every name/acronym of a conference, one row each
+#   edition_h5         editions with the h5 result of the same acronym and year
+#   conference_h5      conferences with their most recent h5 result
+#
+# The file is built in a temporary file and renamed, so readers never see a
+# partial database. Runs as the last step of generate_database_csvs.py, or
+# alone from the CSVs: python3 export_sqlite.py [--output ../out/conferences.db]
+
+OUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'out')
+DB_FILE = 'conferences.db'
+H5_FILE_PATTERN = re.compile(r'^website-(\d{4})\.csv$')
+
+SCHEMA = {
+    'conferences': {
+        'cs_id': 'INTEGER PRIMARY KEY',
+        'name': 'TEXT',
+        'acronym': 'TEXT COLLATE NOCASE',
+        'version': 'INTEGER',
+        'created_at': 'TEXT',
+        'updated_at': 'TEXT'
+    },
+    'conference_editions': {
+        'edition_id': 'INTEGER PRIMARY KEY',
+        'cs_id': 'INTEGER REFERENCES conferences(cs_id)',
+        'name': 'TEXT',
+        'acronym': 'TEXT',
+        'society': 'TEXT',
+        'year': 'INTEGER',
+        'total_citations': 'INTEGER',
+        'total_papers': 'INTEGER',
+        'h5_index': 'INTEGER',
+        'isbn': 'TEXT',
+        'doi': 'TEXT',
+        'extended_issn': 'TEXT',
+        'id_springer': 'TEXT',
+        'id_scholar_conference': 'TEXT',
+        'id_dblp_conference': 'TEXT',
+        'id_openalex_proceedings': 'TEXT',
+        'created_at': 'TEXT'
+    },
+    'conference_additional_names': {
+        'additional_name_id': 'INTEGER PRIMARY KEY',
+        'cs_id': 'INTEGER REFERENCES conferences(cs_id)',
+        'additional_name': 'TEXT',
+        'additional_acronym': 'TEXT COLLATE NOCASE'
+    },
+    'h5_results': {
+        'conference': 'TEXT',
+        'acronym': 'TEXT',
+        'year': 'INTEGER',
+        'topic': 'TEXT',
+        'papers_5y': 'INTEGER',
+        'citations_5y': 'INTEGER',
+        'h5': 'INTEGER',
+        'h5_source': 'TEXT'
+    }
+}
+
+H5_COLUMNS = {
+    'Conference': 'conference',
+    'Acronym': 'acronym',
+    'Year': 'year',
+    'Topic': 'topic',
+    'Papers(5Y)': 'papers_5y',
+    'Citations(5Y)': 'citations_5y',
+    'h5': 'h5',
+    'h5_source': 'h5_source'
+}
+
+INDEXES = [
+    'CREATE INDEX idx_conferences_acronym ON conferences(acronym)',
+    'CREATE INDEX idx_editions_cs_id ON conference_editions(cs_id, year)',
+    'CREATE INDEX idx_editions_acronym ON conference_editions(acronym, year)',
+    'CREATE INDEX idx_additional_names_cs_id ON conference_additional_names(cs_id)',
+    'CREATE INDEX idx_additional_names_acronym ON conference_additional_names(additional_acronym)',
+    'CREATE INDEX idx_h5_results_acronym ON h5_results(acronym, year)'
+]
+
+VIEWS = [
+    '''CREATE VIEW conference_lookup AS
+       SELECT cs_id, name, acronym, 'primary' AS kind FROM conferences
+       UNION ALL
+       SELECT cs_id, additional_name, additional_acronym, 'additional' FROM conference_additional_names''',
+    '''CREATE VIEW edition_h5 AS
+       SELECT e.edition_id, e.cs_id, e.name, e.acronym, e.year, e.h5_index,
+              h.h5, h.papers_5y, h.citations_5y, h.h5_source, h.topic
+       FROM conference_editions e
+       LEFT JOIN h5_results h ON h.acronym = e.acronym AND h.year = e.year''',
+    '''CREATE VIEW conference_h5 AS
+       SELECT c.cs_id, c.name, c.acronym, h.year, h.h5, h.papers_5y, h.citations_5y, h.h5_source, h.topic
+       FROM conferences c
+       LEFT JOIN h5_results h ON h.acronym = c.acronym
+            AND h.year = (SELECT MAX(year) FROM h5_results WHERE acronym = c.acronym)'''
+]
+
+def column_values(df, table):
+    # one tuple per row, in SCHEMA order; '' and NaN become NULL, INTEGER columns become int
+    columns = []
+    for name, sql_type in SCHEMA[table].items():
+        values = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if sql_type.startswith('INTEGER'):
+            numbers = pd.to_numeric(values, errors='coerce')
+            columns.append([None if pd.isna(v) else int(v) for v in numbers])
+        else:
+            columns.append([None if pd.isna(v) or v == '' else str(v) for v in values])
+    return list(zip(*columns))
+
+def create_table(conn, table, df):
+    columns = SCHEMA[table]
+    conn.execute(f"CREATE TABLE {table} ({', '.join(f'{name} {sql_type}' for name, sql_type in columns.items())})")
+    conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})", column_values(df, table))
+
+def create_search_index(conn):
+    # external-content FTS5 would need a single source table; conference_lookup is a view
+    try:
+        conn.execute("CREATE VIRTUAL TABLE conference_search USING fts5("
+                     "cs_id UNINDEXED, name, acronym, kind UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')")
+    except sqlite3.OperationalError as e:
+        print(f"  FTS5 not available in this SQLite build ({e}), skipping conference_search")
+        return False
+    conn.execute("INSERT INTO conference_search SELECT cs_id, name, acronym, kind FROM conference_lookup")
+    return True
+
+def find_h5_files(out_dir):
+    files = []
+    for path in sorted(glob.glob(os.path.join(out_dir, 'website-*.csv'))):
+        if H5_FILE_PATTERN.match(os.path.basename(path)):
+            files.append(path)
+    return files
+
+def load_h5_results(h5_files):
+    frames = [pd.read_csv(path, dtype=str, keep_default_na=False).rename(columns=H5_COLUMNS) for path in h5_files]
+    if not frames:
+        return pd.DataFrame(columns=list(SCHEMA['h5_results']))
+    return pd.concat(frames, ignore_index=True)
+
+def export_sqlite(conf_df, add_df, ed_df, h5_df, db_path):
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            # a half-written file is discarded anyway, no need for a journal
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            with conn:
+                create_table(conn, 'conferences', conf_df)
+                create_table(conn, 'conference_editions', ed_df)
+                create_table(conn, 'conference_additional_names', add_df)
+                create_table(conn, 'h5_results', h5_df)
+                for statement in INDEXES + VIEWS:
+                    conn.execute(statement)
+                if create_search_index(conn):
+                    conn.execute("INSERT INTO conference_search(conference_search) VALUES ('optimize')")
+            conn.execute('ANALYZE')
+        finally:
+            conn.close()
+        os.replace(tmp_path, db_path)
+    finally:
+        # only left behind if the build failed
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_output_csv(out_dir, name):
+    return pd.read_csv(os.path.join(out_dir, name), dtype=str, keep_default_na=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the conference CSVs to an indexed SQLite database')
+    parser.add_argument('--out-dir', default=OUT_DIR, help='directory with the CSVs (default: out/)')
+    parser.add_argument('--output', help=f'database file (default: <out-dir>/{DB_FILE})')
+    args = parser.parse_args(argv)
+
+    db_path = args.output or os.path.join(args.out_dir, DB_FILE)
+    h5_files = find_h5_files(args.out_dir)
+    export_sqlite(read_output_csv(args.out_dir, 'conferences.csv'),
+                  read_output_csv(args.out_dir, 'conference_additional_names.csv'),
+                  read_output_csv(args.out_dir, 'conference_editions.csv'),
+                  load_h5_results(h5_files),
+                  db_path)
+    print(f"Wrote {db_path} (h5 results from {len(h5_files)} files)")
+
+if __name__ == "__main__":
+    main()
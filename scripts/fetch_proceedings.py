@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import csv
+import glob
+import os
+import random
+import sys
+import time
+import aiohttp
+from chapter_range import ProbeError, chapter_range_async, hinted_range
+from response_store import MISS, ResponseStore, normalize_doi
+
+# Proceedings fetcher for every venue (replaces the openalex-get.py and
+# springer-get.py copies that lived in data/<SIGLA>/<PACOTE>/).
+#
+# Usage: python3 fetch_proceedings.py SIGLA PACOTE {openalex,springer} [options]
+#
+# Reads the volumes (DOI, FirstPaper, LastPaper) of every
+# data/SIGLA/PACOTE/*.confseries.csv and fetches their chapters:
+#   openalex -> SIGLA_BEGIN_END_OA_PACOTE.OA-lite.csv next to the confseries
+#   springer -> only fills the response store (needs --api-key or SPRINGER_API_KEY)
+# A volume with failed requests is reported and the run exits with status 1;
+# the .OA-lite.csv is only replaced when every volume was fetched, so a
+# network outage never truncates it (what was fetched stays in the store).
+#
+# Each provider gets one pooled keep-alive aiohttp session, so a crawl opens
+# a handful of connections instead of one TCP+TLS handshake per chapter.
+# Requests go through a token bucket (the provider rate limit) and 429/5xx
+# answers or network errors are retried with jittered exponential backoff.
+# Responses are kept in the shared response store (response_store.py) and
+# chapter ranges come from chapter_range.py.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+
+# rate in requests per second; concurrency = volumes (and connections) at once;
+# batch_size = DOIs per request
+PROVIDERS = {
+    "openalex": {
+        "base_url": os.environ.get("OPENALEX_BASE_URL", "https://api.openalex.org/works"),
+        "rate": 10,         # polite pool (requests with mailto=)
+        "concurrency": 10,
+        "batch_size": 50    # filter=doi:a|b|c takes up to 100 values
+    },
+    "springer": {
+        "base_url": os.environ.get("SPRINGER_BASE_URL", "https://api.springernature.com/meta/v2/json"),
+        "rate": 1,          # be gentle
+        "concurrency": 1,
+        "batch_size": 1
+    }
+}
+
+# BURST = 1 spaces requests evenly, so no one-second window goes over the rate
+BURST = 1
+TIMEOUT = 30
+CONNECT_TIMEOUT = 10
+KEEPALIVE_TIMEOUT = 60
+RETRIES = 5
+BACKOFF = 1.0
+MAX_BACKOFF = 60
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Fields we need (.OA-lite.csv columns)
+FIELDS = [
+    "cited_by_count",
+    "publication_year",
+    "title",
+    "display_name",
+    "conference",
+    "booktitle",
+    "source",
+    "primary_location.source.display_name",
+    "primary_location.source.host_organization_name",
+    "doi",
+    "ids.doi",
+    "authorships.author.display_name",
+    "authorships.raw_author_name"
+]
+
+# Root fields of a work read by openalex_row (select= only takes root fields)
+SELECT_FIELDS = [
+    "doi",
+    "ids",
+    "title",
+    "display_name",
+    "publication_year",
+    "cited_by_count",
+    "biblio",
+    "primary_location",
+    "authorships"
+]
+PER_PAGE = 200
+
+class TokenBucket:
+    """At most `rate` requests per second, with bursts of up to `capacity`"""
+    def __init__(self, rate, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # waiters queue on the lock, so tokens are handed out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class FetchError(Exception):
+    """Some chapters of a volume could not be fetched"""
+
+def error_text(e):
+    # ClientResponseError's str() carries the whole URL (50 DOIs for OpenAlex)
+    if isinstance(e, aiohttp.ClientResponseError):
+        return f"HTTP {e.status} {e.message}"
+    return f"{type(e).__name__} {e}"
+
+class ProviderSession:
+    """Pooled keep-alive session of one provider, rate limited, retrying 429/5xx"""
+    def __init__(self, rate, concurrency, timeout=TIMEOUT, connect_timeout=CONNECT_TIMEOUT,
+                 retries=RETRIES, backoff=BACKOFF):
+        self.bucket = TokenBucket(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.retried = 0
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        return False
+
+    def delay(self, attempt, retry_after=None):
+        # full jitter: a random wait in [0, backoff * 2^attempt], so volumes
+        # failing together do not retry together; Retry-After is a lower bound
+        delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(MAX_BACKOFF, float(retry_after)))
+        return delay
+
+    async def get_json(self, url, params):
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            retry_after = None
+            try:
+                async with self.session.get(url, params=params) as r:
+                    if r.status not in RETRY_STATUS or attempt == self.retries:
+                        r.raise_for_status()
+                        return await r.json(content_type=None)
+                    error = f"HTTP {r.status}"
+                    retry_after = r.headers.get("Retry-After")
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                error = error_text(e)
+            delay = self.delay(attempt, retry_after)
+            self.retried += 1
+            print(f"   ↻ {error}, retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+# ---- OpenAlex ----
+
+async def fetch_openalex_batch(client, dois, base_url, mailto=None):
+    """Fetch the works of several DOIs in one filter=doi:a|b|c query.
+
+    Returns {doi: work or None} (None = not in OpenAlex), or None if the request failed.
+    """
+    url = base_url.rstrip("/")
+    params = {
+        "filter": "doi:" + "|".join(normalize_doi(doi) for doi in dois),
+        "select": ",".join(SELECT_FIELDS),
+        "per-page": str(PER_PAGE),
+        "cursor": "*"
+    }
+    if mailto:
+        params["mailto"] = mailto
+
+    found = {}
+    try:
+        while True:
+            page = await client.get_json(url, params)
+            results = page.get("results", [])
+            for work in results:
+                found[normalize_doi(work.get("doi") or work.get("ids", {}).get("doi"))] = work
+            cursor = page.get("meta", {}).get("next_cursor")
+            if not cursor or not results:
+                break
+            params["cursor"] = cursor
+    except Exception as e:
+        print(f"Error fetching {dois[0]} .. {dois[-1]}: {error_text(e)}")
+        return None
+    return {doi: found.get(normalize_doi(doi)) for doi in dois}
+
+def openalex_row(data):
+    """Map an OpenAlex work to the .OA-lite.csv columns"""
+    return {
+        "title": data.get("title"),
+        "display_name": data.get("display_name"),
+        "cited_by_count": data.get("cited_by_count", 0),
+        "publication_year": data.get("publication_year"),
+        "conference": data.get("biblio", {}).get("conference_name", ""),
+        "booktitle": data.get("biblio", {}).get("container_title", ""),
+        "source": data.get("primary_location", {}).get("source", {}).get("display_name", ""),
+        "primary_location.source.display_name": data.get("primary_location", {}).get("source", {}).get("host_organization_name", ""),
+        "primary_location.source.host_organization_name": data.get("primary_location", {}).get("source", {}).get("host_organization_name", ""),
+        "doi": data.get("doi") or data.get("ids", {}).get("doi", ""),
+        "ids.doi": data.get("ids", {}).get("doi", ""),
+        "authorships.author.display_name": " | ".join([
+            a.get("author", {}).get("display_name") or a.get("raw_author_name", "")
+            for a in data.get("authorships", [])
+        ]),
+        "authorships.raw_author_name": " | ".join([
+            a.get("raw_author_name", "")
+            for a in data.get("authorships", [])
+        ])
+    }
+
+async def fetch_works(client, store, dois, args):
+    """Works of the given DOIs from the response store, fetching only the ones not stored"""
+    works = {doi: store.get("openalex", doi, SELECT_FIELDS) for doi in dois}
+    missing = [doi for doi, work in works.items() if work is MISS]
+    if not missing:
+        return works
+    print(f"   → Fetching chapter DOIs: {missing[0]} .. {missing[-1]} ({len(dois) - len(missing)} stored)")
+    fetched = await fetch_openalex_batch(client, missing, args.base_url, args.mailto)
+    if fetched is None:
+        return None
+    for doi, work in fetched.items():
+        store.put("openalex", doi, work, SELECT_FIELDS)
+    works.update(fetched)
+    return works
+
+async def fetch_openalex_volume(client, store, base_doi, first_hint, last_hint, args):
+    """Works of the chapters of a volume, in order"""
+    first = hinted_range(first_hint, last_hint)[0]
+    batch_size = args.batch_size
+
+    def batch(start, end):
+        return [f"{base_doi}_{s}" for s in range(start, end + 1)]
+
+    async def probe(suffix):
+        # a probe fetches the whole batch holding suffix (batches are aligned on the
+        # first chapter), so the final pass only requests batches no probe touched
+        doi = f"{base_doi}_{suffix}"
+        work = store.get("openalex", doi, SELECT_FIELDS)
+        if work is MISS:
+            start = first + (suffix - first) // batch_size * batch_size
+            works = await fetch_works(client, store, batch(start, start + batch_size - 1), args)
+            if works is None:
+                return None  # request failed: unknown, not missing
+            work = works[doi]
+        return work is not None
+
+    found = await chapter_range_async(probe, first_hint, last_hint)
+    if found is None:
+        print(f"   × No chapters found for {base_doi}")
+        return []
+    first_paper, last_paper = found
+    print(f"\n first paper = {first_paper}   last paper = {last_paper}")
+
+    # with the range known, the remaining batches are requested at once
+    starts = list(range(first_paper, last_paper + 1, batch_size))
+    batches = await asyncio.gather(*(
+        fetch_works(client, store, batch(start, min(start + batch_size - 1, last_paper)), args)
+        for start in starts
+    ))
+    chapters = []
+    failed = 0
+    for start, works in zip(starts, batches):
+        if works is None:
+            failed += 1
+            continue
+        for doi, work in works.items():
+            if work is None:
+                print(f"   ! Missing chapter {doi}")
+            else:
+                chapters.append(work)
+    if failed:
+        raise FetchError(f"{base_doi}: {failed} of {len(starts)} batches failed")
+    return chapters
+
+# ---- Springer Nature Meta API ----
+
+async def springer_chapter(client, store, doi, args):
+    """Meta API response of a chapter, or None on a request error (not stored, so it is retried next run)"""
+    data = store.get("springer", doi)
+    if data is not MISS:
+        return data
+    print(f"   → Fetching chapter DOI: {doi}")
+    try:
+        data = await client.get_json(args.base_url, {"q": f"doi:{doi}", "api_key": args.api_key})
+    except Exception as e:
+        print(f"Error fetching {doi}: {error_text(e)}")
+        return None
+    # "no record" answers are stored too, so re-runs do not ask again
+    store.put("springer", doi, data)
+    return data
+
+async def fetch_springer_volume(client, store, base_doi, first_hint, last_hint, args):
+    """Meta API records of the chapters of a volume, in order"""
+    base_doi = normalize_doi(base_doi)
+
+    async def probe(suffix):
+        data = await springer_chapter(client, store, f"{base_doi}_{suffix}", args)
+        if data is None:
+            return None  # request failed: unknown, not missing
+        return bool(data.get("records"))
+
+    found = await chapter_range_async(probe, first_hint, last_hint)
+    if found is None:
+        print(f"   × No chapters found for {base_doi}")
+        return []
+    first_paper, last_paper = found
+    print(f"\n first paper = {first_paper}   last paper = {last_paper}")
+
+    chapters = []
+    failed = 0
+    for suffix in range(first_paper, last_paper + 1):
+        data = await springer_chapter(client, store, f"{base_doi}_{suffix}", args)
+        if data is None:
+            failed += 1
+        elif data.get("records"):
+            chapters.extend(data["records"])
+        else:
+            print(f"   ! Missing chapter {base_doi}_{suffix}")
+    if failed:
+        raise FetchError(f"{base_doi}: {failed} of {last_paper - first_paper + 1} chapters failed")
+    return chapters
+
+FETCH_VOLUME = {
+    "openalex": fetch_openalex_volume,
+    "springer": fetch_springer_volume
+}
+
+# ---- Files ----
+
+def confseries_files(sigla, pacote, data_dir=DATA_DIR):
+    return sorted(glob.glob(os.path.join(data_dir, sigla, pacote, "*.confseries.csv")))
+
+def oa_lite_file(confseries, pacote):
+    # ICVNS_2018_2024_springer_2025_09.confseries.csv -> ICVNS_2018_2024_OA_2025_09.OA-lite.csv
+    name = os.path.basename(confseries)[:-len(f"_{pacote}.confseries.csv")]
+    return os.path.join(os.path.dirname(confseries), f"{name.rsplit('_', 1)[0]}_OA_{pacote}.OA-lite.csv")
+
+def read_volumes(confseries):
+    # [(DOI, FirstPaper, LastPaper)], one per volume, in file order
+    with open(confseries, newline="", encoding="utf-8") as f:
+        volumes = {}
+        for row in csv.DictReader(f):
+            if row.get("DOI") and row["DOI"] not in volumes:
+                volumes[row["DOI"]] = (row["DOI"], row.get("FirstPaper"), row.get("LastPaper"))
+    return list(volumes.values())
+
+async def fetch_confseries(client, store, provider, confseries, output, args):
+    """Fetch the volumes of a .confseries.csv; returns (chapters, failed volumes)"""
+    volumes = asyncio.Semaphore(args.concurrency)
+
+    async def fetch_book(base_doi, first_hint, last_hint):
+        async with volumes:
+            print(f"\n📘 Processing book DOI: {base_doi}")
+            try:
+                return await FETCH_VOLUME[provider](client, store, base_doi, first_hint, last_hint, args)
+            except ProbeError as e:
+                raise FetchError(f"{base_doi}: {e}") from e
+
+    # volumes run concurrently but are written in the order of the input
+    books = [asyncio.ensure_future(fetch_book(*volume)) for volume in read_volumes(confseries)]
+    tmp = f"{output}.{os.getpid()}.tmp" if output else os.devnull
+    count = 0
+    failed = 0
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f_out:
+            writer = csv.DictWriter(f_out, fieldnames=FIELDS)
+            writer.writeheader()
+            for book in books:
+                try:
+                    chapters = await book
+                except FetchError as e:
+                    print(f"   ✗ Failed {e}")
+                    failed += 1
+                    continue
+                count += len(chapters)
+                if output:
+                    writer.writerows(openalex_row(data) for data in chapters)
+        if output and not failed:
+            os.replace(tmp, output)
+    finally:
+        if output and os.path.exists(tmp):
+            os.remove(tmp)
+    return count, failed
+
+async def fetch_proceedings(sigla, pacote, provider, args):
+    """Fetch every .confseries.csv of data/SIGLA/PACOTE; returns the number of failed volumes"""
+    files = confseries_files(sigla, pacote, args.data_dir)
+    if not files:
+        raise FileNotFoundError(f"No .confseries.csv in {os.path.join(args.data_dir, sigla, pacote)}")
+
+    failed = 0
+    with ResponseStore() as store:
+        # one session (connection pool) for the whole run of the provider
+        async with ProviderSession(args.rate, args.concurrency, args.timeout, args.connect_timeout,
+                                   args.retries, args.backoff) as client:
+            for confseries in files:
+                output = oa_lite_file(confseries, pacote) if provider == "openalex" else None
+                print(f"\n📂 {os.path.basename(confseries)} ({provider})")
+                count, failed_volumes = await fetch_confseries(client, store, provider, confseries, output, args)
+                failed += failed_volumes
+                if failed_volumes:
+                    print(f"\n✗ {failed_volumes} volumes failed ({count} chapters fetched)"
+                          + (f", {output} left unchanged; run again to retry" if output else "; run again to retry"))
+                else:
+                    print(f"\n✅ {count} chapters" + (f", saved to {output}" if output else ""))
+            if client.retried:
+                print(f"\n↻ {client.retried} requests retried")
+        print(f"\n💾 Response store: {store.summary()}")
+    return failed
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Fetch the proceedings chapters of a venue (.confseries.csv volumes)")
+    parser.add_argument("sigla")
+    parser.add_argument("pacote")
+    parser.add_argument("provider", choices=sorted(PROVIDERS))
+    parser.add_argument("--data-dir", default=DATA_DIR, help="folder with SIGLA/PACOTE/ (default: the repo data/)")
+    parser.add_argument("--rate", type=float, help="requests per second (default: per provider)")
+    parser.add_argument("--concurrency", type=int, help="volumes and connections at once (default: per provider)")
+    parser.add_argument("--batch-size", type=int, help="DOIs per OpenAlex request (default: per provider)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per request (default: %(default)s)")
+    parser.add_argument("--connect-timeout", type=float, default=CONNECT_TIMEOUT,
+                        help="seconds to open a connection (default: %(default)s)")
+    parser.add_argument("--retries", type=int, default=RETRIES, help="retries on 429/5xx and network errors (default: %(default)s)")
+    parser.add_argument("--backoff", type=float, default=BACKOFF,
+                        help="base of the jittered exponential backoff, seconds (default: %(default)s)")
+    parser.add_argument("--base-url", help="API endpoint, e.g. a local stub server (default: per provider, env OPENALEX_BASE_URL/SPRINGER_BASE_URL)")
+    parser.add_argument("--mailto", default=os.environ.get("OPENALEX_MAILTO"),
+                        help="contact e-mail for the OpenAlex polite pool (env OPENALEX_MAILTO)")
+    parser.add_argument("--api-key", default=os.environ.get("SPRINGER_API_KEY"),
+                        help="Springer Nature Meta API key (env SPRINGER_API_KEY), "
+                             "see https://datasolutions.springernature.com/account/api-management/")
+    args = parser.parse_args(argv[1:])
+
+    for name, value in PROVIDERS[args.provider].items():
+        if getattr(args, name) is None:
+            setattr(args, name, value)
+    if args.provider == "springer" and not args.api_key:
+        parser.error("springer needs --api-key (or SPRINGER_API_KEY)")
+
+    start = time.monotonic()
+    try:
+        failed = asyncio.run(fetch_proceedings(args.sigla, args.pacote, args.provider, args))
+    except FileNotFoundError as e:
+        print(e)
+        return 1
+    print(f"\nDone in {time.monotonic() - start:.1f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
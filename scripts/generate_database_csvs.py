@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
 import pandas as pd
+import numpy as np
 import json
 import glob
+import hashlib
+import io
 import os
+import pickle
 import re
+import argparse
 from datetime import datetime
+from functools import lru_cache
+from itertools import combinations
+from concurrent.futures import ThreadPoolExecutor
+from export_sqlite import DB_FILE, export_sqlite, find_h5_files, load_h5_results
 
 def load_config():
     config_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'config.json')
@@ -13,9 +22,10 @@ def load_config():
     with open(config_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+RULES_PATH = os.path.join(os.path.dirname(__file__), 'rename_rules.json')
+
 def load_rename_rules():
-    rules_path = os.path.join(os.path.dirname(__file__), 'rename_rules.json')
-    with open(rules_path, 'r', encoding='utf-8') as f:
+    with open(RULES_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 def normalize_column_name(df, possible_names):
@@ -24,18 +34,58 @@ def normalize_column_name(df, possible_names):
             return name
     return None
 
-def extract_id_from_url(url, pattern):
-    if not url or pd.isna(url):
-        return ''
-    match = re.search(pattern, str(url))
-    return match.group(1) if match else ''
-
-def extract_numeric_id(comp_id):
-    if comp_id and comp_id.startswith('CompID'):
-        return int(comp_id[6:])
-    return 0
-
-def load_qualis(config):
+def extract_numeric_ids(comp_ids):
+    comp_ids = pd.Series(comp_ids, dtype=object).reset_index(drop=True)
+    is_comp_id = comp_ids.str.startswith('CompID', na=False)
+    numeric = comp_ids.where(is_comp_id, 'CompID0').str[6:].astype('int64')
+    return numeric.to_numpy()
+
+def column_or_default(df, name, default):
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+def has_value(series):
+    return series.notna() & (series != '')
+
+def blank_if_missing(series):
+    return series.where(has_value(series), '').reset_index(drop=True)
+
+def index_by_value(values):
+    index = {}
+    for pos, value in enumerate(values):
+        index.setdefault(value, []).append(pos)
+    return index
+
+def find_root(parent, item):
+    root = item
+    while parent.get(root, root) != root:
+        root = parent[root]
+    while item != root:
+        parent[item], item = root, parent[item]
+    return root
+
+def union_into(parent, item, target):
+    item_root = find_root(parent, item)
+    target_root = find_root(parent, target)
+    if item_root != target_root:
+        parent[item_root] = target_root
+
+def resolve_groups(pairs):
+    parent = {}
+    for target, item in pairs:
+        union_into(parent, item, target)
+
+    groups = {}
+    for target, item in pairs:
+        root = find_root(parent, target)
+        members = groups.setdefault(root, [])
+        for member in (target, item):
+            if member != root and member not in members:
+                members.append(member)
+    return groups
+
+def qualis_path(config):
     path = config['data_sources']['qualis_2017']['path']
 
     if path.startswith('../'):
@@ -47,7 +97,10 @@ def load_qualis(config):
     if not os.path.exists(path):
         raise FileNotFoundError(f"Qualis dataset not found at {path}")
 
-    return pd.read_csv(path, encoding='utf-8')
+    return path
+
+def load_qualis(config):
+    return pd.read_csv(qualis_path(config), encoding='utf-8')
 
 def load_ce_files(config):
     ce_config = config['data_sources']['ce_2024']
@@ -71,110 +124,175 @@ def load_ce_files(config):
     return []
 
 def process_qualis(df, rename_rules):
-    processed = []
-    duplicates_to_remove = set()
-
     qualis_dups = rename_rules.get('qualis_duplicates', {}).get('unify', {})
-    for sigla, dup_info in qualis_dups.items():
-        for comp_id in dup_info.get('remove', []):
-            duplicates_to_remove.add(comp_id)
+    duplicate_groups = resolve_groups([
+        (dup_info['keep'], comp_id)
+        for dup_info in qualis_dups.values() if dup_info.get('keep')
+        for comp_id in dup_info.get('remove', [])
+    ])
+    duplicates_to_remove = {comp_id for members in duplicate_groups.values() for comp_id in members}
+    # rules without 'keep' just list ids to drop
+    duplicates_to_remove.update(
+        comp_id
+        for dup_info in qualis_dups.values() if not dup_info.get('keep')
+        for comp_id in dup_info.get('remove', [])
+    )
+
+    sigla = column_or_default(df, 'Sigla', '')
+    comp_id = column_or_default(df, 'ID Conferencia', '')
+    valid = has_value(sigla) & has_value(comp_id)
+
+    removed = valid & comp_id.isin(duplicates_to_remove)
+    for dup_comp_id, dup_sigla in zip(comp_id[removed], sigla[removed]):
+        print(f"  Removing Qualis duplicate: {dup_comp_id} ({dup_sigla})")
+
+    keep = valid & ~removed
+    processed = pd.DataFrame({
+        'comp_id': comp_id[keep],
+        'sigla': sigla[keep],
+        'nome': column_or_default(df, 'Nome do evento', '')[keep],
+        'siglas_alt': column_or_default(df, 'Siglas Alternativas', '')[keep],
+        'nomes_alt': column_or_default(df, 'Nomes Alternativos', '')[keep],
+        'origem': column_or_default(df, 'Origem Cadastro', 'Qualis 2017')[keep],
+        'avaliacao': column_or_default(df, 'Avaliação SBC', '')[keep],
+        'gs_id': column_or_default(df, 'GS ID', '')[keep],
+        'dblp_id': column_or_default(df, 'DBLP ID', '')[keep],
+        'sociedade': column_or_default(df, 'Sociedade', '')[keep],
+        'ano_dados': column_or_default(df, 'Ano Dados', '')[keep]
+    })
+
+    return processed.reset_index(drop=True)
+
+# rename_rules.json compiled into hash indexes, once per run:
+#   absorbed:  sigla -> unified name (from unifications[*].absorbs)
+#   decisions: (sigla, nova_sigla) -> 'ignore' | 'unify' | 'force'
+# so each CE row needs a single dict lookup. Renames without a rule are applied.
+# errors: cyclic rules or siglas with more than one target (they stop the build);
+# warnings: rules overridden by an ignore_renames entry for the same pair.
+def compile_rename_rules(rename_rules):
+    absorbed = {}
+    decisions = {}
+    targets = {}
+    errors = []
+    warnings = []
 
-    for idx, row in df.iterrows():
-        sigla = row.get('Sigla', '')
-        if not sigla or pd.isna(sigla):
-            continue
+    for unified_name, rules in rename_rules.get('unifications', {}).items():
+        for sigla in rules.get('absorbs', []):
+            if sigla in absorbed and absorbed[sigla] != unified_name:
+                errors.append(f"{sigla} is absorbed by both {absorbed[sigla]} and {unified_name}")
+                continue
+            absorbed[sigla] = unified_name
+            decisions[(sigla, unified_name)] = 'unify'
+            targets.setdefault(sigla, set()).add(unified_name)
 
-        comp_id = row.get('ID Conferencia', '')
-        if not comp_id or pd.isna(comp_id):
+    for sigla, rule in rename_rules.get('force_renames', {}).items():
+        new_name = rule.get('new_name')
+        if not new_name:
             continue
-
-        if comp_id in duplicates_to_remove:
-            print(f"  Removing Qualis duplicate: {comp_id} ({sigla})")
+        decisions.setdefault((sigla, new_name), 'force')
+        targets.setdefault(sigla, set()).add(new_name)
+        if sigla in absorbed and absorbed[sigla] != new_name:
+            errors.append(f"{sigla} is forced to {new_name} but absorbed by {absorbed[sigla]}")
+
+    for sigla, rule in rename_rules.get('ignore_renames', {}).items():
+        wrong_rename = rule.get('wrong_rename')
+        if not wrong_rename:
             continue
+        if (sigla, wrong_rename) in decisions:
+            warnings.append(f"{sigla} -> {wrong_rename} is ignored but also listed in "
+                            f"{'unifications' if decisions[(sigla, wrong_rename)] == 'unify' else 'force_renames'}")
+        decisions[(sigla, wrong_rename)] = 'ignore'
+        targets.get(sigla, set()).discard(wrong_rename)
 
-        processed.append({
-            'comp_id': comp_id,
-            'sigla': sigla,
-            'nome': row.get('Nome do evento', ''),
-            'siglas_alt': row.get('Siglas Alternativas', ''),
-            'nomes_alt': row.get('Nomes Alternativos', ''),
-            'origem': row.get('Origem Cadastro', 'Qualis 2017'),
-            'avaliacao': row.get('Avaliação SBC', ''),
-            'gs_id': row.get('GS ID', ''),
-            'dblp_id': row.get('DBLP ID', ''),
-            'sociedade': row.get('Sociedade', ''),
-            'ano_dados': row.get('Ano Dados', '')
-        })
+    errors.extend(f"Cyclic rename rules: {' -> '.join(cycle)}" for cycle in rule_cycles(targets))
 
-    return pd.DataFrame(processed)
+    return {'absorbed': absorbed, 'decisions': decisions, 'errors': errors, 'warnings': warnings}
 
-def should_apply_rename(sigla, nova_sigla, rename_rules, existing_siglas):
+def rule_cycles(targets):
+    cycles = []
+    state = {}
+    for start in targets:
+        if start in state:
+            continue
+        path = [start]
+        pending = [iter(sorted(targets.get(start, ())))]
+        state[start] = 'open'
+        while pending:
+            node = next(pending[-1], None)
+            if node is None:
+                state[path.pop()] = 'done'
+                pending.pop()
+            elif state.get(node) == 'open':
+                cycles.append(path[path.index(node):] + [node])
+            elif node not in state:
+                state[node] = 'open'
+                path.append(node)
+                pending.append(iter(sorted(targets.get(node, ()))))
+    return cycles
+
+# None when the row keeps its sigla, otherwise 'unify', 'force' or 'rename'
+def rename_decision(rule_index, sigla, nova_sigla):
     if not nova_sigla or nova_sigla == sigla:
-        return False
-
-    ignore_list = rename_rules.get('ignore_renames', {})
-    if sigla in ignore_list and ignore_list[sigla].get('wrong_rename') == nova_sigla:
-        return False
+        return None
+    decision = rule_index['decisions'].get((sigla, nova_sigla), 'rename')
+    return None if decision == 'ignore' else decision
+
+def optional_column(df, possible_names):
+    col = normalize_column_name(df, possible_names)
+    if not col:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[col].where(df[col].notna(), '')
+
+def extract_ids_from_urls(urls, pattern):
+    return urls.astype(str).str.extract(pattern, expand=False).fillna('')
+
+# Parses one CE file and normalizes its columns. Independent of the other files,
+# so all files can be read concurrently; see process_ce_file for the sequential part.
+def read_ce_file(filepath):
+    df = pd.read_csv(filepath, encoding='utf-8')
+    ce_name = os.path.basename(filepath).replace('.ce.csv', '').replace('SBC-', '')
 
-    force_list = rename_rules.get('force_renames', {})
-    if sigla in force_list and force_list[sigla].get('new_name') == nova_sigla:
-        return True
+    sigla_col = normalize_column_name(df, ['SIGLA', 'Sigla', 'sigla'])
+    if not sigla_col:
+        return {'ce_name': ce_name, 'total': 0, 'rows': None}
 
-    unifications = rename_rules.get('unifications', {})
-    for unified_name, rules in unifications.items():
-        if nova_sigla == unified_name and sigla in rules.get('absorbs', []):
-            return True
+    sigla = df[sigla_col].where(df[sigla_col].notna(), '').astype(str).str.strip()
+    rows = pd.DataFrame({
+        'sigla': sigla,
+        'nome': optional_column(df, ['NOME', 'Nome', 'nome', 'Nome do evento']),
+        'gs_id': extract_ids_from_urls(optional_column(df, ['GOOGLE METRICS LINK', 'Link GS']), r'venue=([^&\s]+)'),
+        'dblp_id': extract_ids_from_urls(optional_column(df, ['Link da DBLP', 'Link DBLP']), r'/db/conf/([^/]+)/'),
+        'top': optional_column(df, ['TOP', 'Top']),
+        'nova_sigla': optional_column(df, ['Nova Sigla', 'nova sigla']),
+        'novo_nome': optional_column(df, ['Novo Nome', 'novo nome'])
+    })
+    rows = rows[(sigla != '') & (sigla != 'nan')]
 
-    return True
+    return {'ce_name': ce_name, 'total': int(df[sigla_col].notna().sum()), 'rows': rows}
 
-def handle_unification(sigla, nova_sigla, rename_rules):
-    unifications = rename_rules.get('unifications', {})
-    for unified_name, rules in unifications.items():
-        if nova_sigla == unified_name and sigla in rules.get('absorbs', []):
-            return True, unified_name
-    return False, None
+def read_ce_files(ce_files, max_workers=None):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_ce_file, ce_files))
 
-def process_ce_file(filepath, existing_siglas, rename_rules, next_comp_id):
-    df = pd.read_csv(filepath, encoding='utf-8')
-    ce_name = os.path.basename(filepath).replace('.ce.csv', '').replace('SBC-', '')
+def process_ce_file(ce_data, existing_siglas, rule_index, next_comp_id):
+    ce_name = ce_data['ce_name']
 
     new_conferences = []
     updates = {}
     unifications = {}
 
-    sigla_col = normalize_column_name(df, ['SIGLA', 'Sigla', 'sigla'])
-    nome_col = normalize_column_name(df, ['NOME', 'Nome', 'nome', 'Nome do evento'])
-    gs_col = normalize_column_name(df, ['GOOGLE METRICS LINK', 'Link GS'])
-    dblp_col = normalize_column_name(df, ['Link da DBLP', 'Link DBLP'])
-    top_col = normalize_column_name(df, ['TOP', 'Top'])
-    nova_sigla_col = normalize_column_name(df, ['Nova Sigla', 'nova sigla'])
-    novo_nome_col = normalize_column_name(df, ['Novo Nome', 'novo nome'])
-
-    if not sigla_col:
+    if ce_data['rows'] is None:
         return new_conferences, updates, unifications, next_comp_id
 
-    for idx, row in df.iterrows():
-        sigla = str(row[sigla_col]).strip() if pd.notna(row[sigla_col]) else ''
-        if not sigla or sigla == 'nan':
-            continue
-
-        nome = row[nome_col] if nome_col and pd.notna(row.get(nome_col)) else ''
-        gs_url = row[gs_col] if gs_col and pd.notna(row.get(gs_col)) else ''
-        dblp_url = row[dblp_col] if dblp_col and pd.notna(row.get(dblp_col)) else ''
-        top = row[top_col] if top_col and pd.notna(row.get(top_col)) else ''
-        nova_sigla = row[nova_sigla_col] if nova_sigla_col and pd.notna(row.get(nova_sigla_col)) else ''
-        novo_nome = row[novo_nome_col] if novo_nome_col and pd.notna(row.get(novo_nome_col)) else ''
-
-        gs_id = extract_id_from_url(gs_url, r'venue=([^&\s]+)')
-        dblp_id = extract_id_from_url(dblp_url, r'/db/conf/([^/]+)/')
-
+    rows = ce_data['rows']
+    columns = zip(rows['sigla'], rows['nome'], rows['gs_id'], rows['dblp_id'],
+                  rows['top'], rows['nova_sigla'], rows['novo_nome'])
+    for sigla, nome, gs_id, dblp_id, top, nova_sigla, novo_nome in columns:
         if sigla in existing_siglas:
-            if nova_sigla and should_apply_rename(sigla, nova_sigla, rename_rules, existing_siglas):
-                is_unification, unified_name = handle_unification(sigla, nova_sigla, rename_rules)
-                if is_unification:
-                    if unified_name not in unifications:
-                        unifications[unified_name] = []
-                    unifications[unified_name].append(sigla)
+            decision = rename_decision(rule_index, sigla, nova_sigla)
+            if decision:
+                if decision == 'unify':
+                    unifications.setdefault(nova_sigla, []).append(sigla)
                 else:
                     updates[sigla] = {
                         'nova_sigla': nova_sigla,
@@ -198,7 +316,7 @@ def process_ce_file(filepath, existing_siglas, rename_rules, next_comp_id):
             alt_sigla = ''
             alt_nome = ''
 
-            if nova_sigla and not should_apply_rename(sigla, nova_sigla, rename_rules, existing_siglas):
+            if not rename_decision(rule_index, sigla, nova_sigla):
                 nova_sigla = ''
 
             if nova_sigla:
@@ -225,50 +343,103 @@ def process_ce_file(filepath, existing_siglas, rename_rules, next_comp_id):
 
     return new_conferences, updates, unifications, next_comp_id
 
-def apply_unifications(df, all_unifications, rename_rules):
-    for unified_name, siglas_to_unify in all_unifications.items():
-        if not siglas_to_unify:
+def unification_groups(all_unifications, rule_index):
+    pairs = [(unified_name, sigla) for unified_name, siglas in all_unifications.items() for sigla in siglas]
+    pairs.extend((unified_name, sigla) for sigla, unified_name in rule_index['absorbed'].items())
+    return resolve_groups(pairs)
+
+def apply_unifications(df, all_unifications, rule_index):
+    columns = ['sigla', 'siglas_alt', 'gs_id', 'dblp_id']
+    data = {col: df[col].to_numpy(dtype=object, copy=True) for col in columns}
+    rows_by_sigla = index_by_value(data['sigla'])
+    keep = np.ones(len(df), dtype=bool)
+
+    for unified_name, members in unification_groups(all_unifications, rule_index).items():
+        sources = [sigla for sigla in members if sigla in rows_by_sigla]
+        if not sources:
             continue
 
-        target_mask = df['sigla'] == unified_name
-        if not target_mask.any():
-            first_sigla = siglas_to_unify[0]
-            target_mask = df['sigla'] == first_sigla
-            if target_mask.any():
-                df.loc[target_mask, 'sigla'] = unified_name
+        alternatives = []
+        target = rows_by_sigla.get(unified_name)
+        if not target:
+            promoted = sources.pop(0)
+            target = rows_by_sigla[promoted]
+            data['sigla'][target] = unified_name
+            alternatives.append(promoted)
 
-        for sigla in siglas_to_unify:
-            if sigla == unified_name:
-                continue
+        first = target[0]
+        current_alt = data['siglas_alt'][first]
+        if current_alt and not pd.isna(current_alt):
+            alternatives.insert(0, current_alt)
 
-            source_mask = df['sigla'] == sigla
-            if source_mask.any() and target_mask.any():
-                source_row = df.loc[source_mask].iloc[0]
+        for sigla in sources:
+            rows = rows_by_sigla[sigla]
+            source = rows[0]
+            alternatives.append(sigla)
 
-                current_alt = df.loc[target_mask, 'siglas_alt'].values[0]
-                if current_alt and not pd.isna(current_alt):
-                    df.loc[target_mask, 'siglas_alt'] = f"{current_alt}|{sigla}"
-                else:
-                    df.loc[target_mask, 'siglas_alt'] = sigla
+            source_alt = data['siglas_alt'][source]
+            if source_alt and not pd.isna(source_alt):
+                alternatives.append(source_alt)
+
+            for field in ['gs_id', 'dblp_id']:
+                value = data[field][source]
+                if value and not pd.isna(value) and pd.isna(data[field][first]):
+                    data[field][target] = value
+
+            keep[rows] = False
+
+        data['siglas_alt'][target] = '|'.join(alternatives)
+
+    df = df.copy()
+    for col in columns:
+        df[col] = data[col]
+    return df[keep]
 
-                source_alt = source_row['siglas_alt']
-                if source_alt and not pd.isna(source_alt):
-                    current = df.loc[target_mask, 'siglas_alt'].values[0]
-                    df.loc[target_mask, 'siglas_alt'] = f"{current}|{source_alt}"
+def join_alternative(current, value):
+    if current and not pd.isna(current):
+        return f"{current}|{value}"
+    return value
 
-                if source_row['gs_id'] and not pd.isna(source_row['gs_id']):
-                    if pd.isna(df.loc[target_mask, 'gs_id'].values[0]):
-                        df.loc[target_mask, 'gs_id'] = source_row['gs_id']
+def apply_updates(df, all_updates):
+    columns = ['sigla', 'nome', 'siglas_alt', 'nomes_alt', 'gs_id', 'dblp_id', 'avaliacao']
+    data = {col: df[col].to_numpy(dtype=object, copy=True) for col in columns}
+    rows_by_sigla = index_by_value(data['sigla'])
 
-                if source_row['dblp_id'] and not pd.isna(source_row['dblp_id']):
-                    if pd.isna(df.loc[target_mask, 'dblp_id'].values[0]):
-                        df.loc[target_mask, 'dblp_id'] = source_row['dblp_id']
+    for sigla, update_info in all_updates.items():
+        rows = rows_by_sigla.get(sigla)
+        if not rows:
+            continue
+        first = rows[0]
+
+        if 'nova_sigla' in update_info and update_info['nova_sigla']:
+            nova_sigla = update_info['nova_sigla']
+            old_sigla = data['sigla'][first]
+            old_nome = data['nome'][first]
+
+            data['sigla'][rows] = nova_sigla
+            data['siglas_alt'][rows] = join_alternative(data['siglas_alt'][first], old_sigla)
+            if nova_sigla != sigla:
+                del rows_by_sigla[sigla]
+                rows_by_sigla[nova_sigla] = sorted(rows_by_sigla.get(nova_sigla, []) + rows)
+
+            if 'novo_nome' in update_info and update_info['novo_nome']:
+                data['nome'][rows] = update_info['novo_nome']
+                if old_nome != update_info['novo_nome']:
+                    data['nomes_alt'][rows] = join_alternative(data['nomes_alt'][first], old_nome)
 
-                df = df[~source_mask]
+        for field in ['gs_id', 'dblp_id', 'avaliacao']:
+            if field in update_info and update_info[field]:
+                if pd.isna(data[field][first]):
+                    data[field][rows] = update_info[field]
 
+    df = df.copy()
+    for col in columns:
+        df[col] = data[col]
     return df
 
-def merge_all(qualis_df, ce_files, config, rename_rules):
+def merge_all(qualis_df, ce_files, config, rename_rules, ce_data_list=None, rule_index=None):
+    if rule_index is None:
+        rule_index = compile_rename_rules(rename_rules)
     result = qualis_df.copy()
     existing_siglas = set(result['sigla'].values)
 
@@ -280,13 +451,15 @@ def merge_all(qualis_df, ce_files, config, rename_rules):
     ce_total = 0
     duplicates_found = 0
 
-    for ce_file in ce_files:
+    # parsing runs in parallel; comp_id assignment follows the order of ce_files
+    if ce_data_list is None:
+        ce_data_list = read_ce_files(ce_files)
+    for ce_data in ce_data_list:
         new_confs, updates, unifications, next_comp_id = process_ce_file(
-            ce_file, existing_siglas, rename_rules, next_comp_id
+            ce_data, existing_siglas, rule_index, next_comp_id
         )
 
-        ce_df = pd.read_csv(ce_file, encoding='utf-8')
-        ce_total += len(ce_df[ce_df['SIGLA'].notna()])
+        ce_total += ce_data['total']
         duplicates_found += len(updates)
 
         all_new.extend(new_confs)
@@ -304,38 +477,9 @@ def merge_all(qualis_df, ce_files, config, rename_rules):
         new_df = pd.DataFrame(all_new)
         result = pd.concat([result, new_df], ignore_index=True)
 
-    for sigla, update_info in all_updates.items():
-        mask = result['sigla'] == sigla
-        if not mask.any():
-            continue
-
-        if 'nova_sigla' in update_info and update_info['nova_sigla']:
-            old_sigla = result.loc[mask, 'sigla'].values[0]
-            old_nome = result.loc[mask, 'nome'].values[0]
-
-            result.loc[mask, 'sigla'] = update_info['nova_sigla']
-
-            current_alt = result.loc[mask, 'siglas_alt'].values[0]
-            if current_alt and not pd.isna(current_alt):
-                result.loc[mask, 'siglas_alt'] = f"{current_alt}|{old_sigla}"
-            else:
-                result.loc[mask, 'siglas_alt'] = old_sigla
-
-            if 'novo_nome' in update_info and update_info['novo_nome']:
-                result.loc[mask, 'nome'] = update_info['novo_nome']
-                if old_nome != update_info['novo_nome']:
-                    current_alt_nome = result.loc[mask, 'nomes_alt'].values[0]
-                    if current_alt_nome and not pd.isna(current_alt_nome):
-                        result.loc[mask, 'nomes_alt'] = f"{current_alt_nome}|{old_nome}"
-                    else:
-                        result.loc[mask, 'nomes_alt'] = old_nome
+    result = apply_updates(result, all_updates)
 
-        for field in ['gs_id', 'dblp_id', 'avaliacao']:
-            if field in update_info and update_info[field]:
-                if pd.isna(result.loc[mask, field].values[0]):
-                    result.loc[mask, field] = update_info[field]
-
-    result = apply_unifications(result, all_unifications, rename_rules)
+    result = apply_unifications(result, all_unifications, rule_index)
 
     print(f"\nStatistics:")
     print(f"  Total from Qualis: {len(qualis_df)}")
@@ -348,46 +492,92 @@ def merge_all(qualis_df, ce_files, config, rename_rules):
     return result
 
 def create_conferences_csv(df):
-    conferences = []
     timestamp = datetime.now().isoformat()
 
-    for idx, row in df.iterrows():
-        comp_id = row['comp_id']
-        conferences.append({
-            'cs_id': extract_numeric_id(comp_id),
-            'name': row['nome'],
-            'acronym': row['sigla'],
-            'version': 1,
-            'created_at': timestamp,
-            'updated_at': timestamp
-        })
-
-    return pd.DataFrame(conferences)
-
+    return pd.DataFrame({
+        'cs_id': extract_numeric_ids(df['comp_id']),
+        'name': df['nome'].to_numpy(),
+        'acronym': df['sigla'].to_numpy(),
+        'version': 1,
+        'created_at': timestamp,
+        'updated_at': timestamp
+    })
+
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+PARENTHESES_PATTERN = re.compile(r'\([^)]*\)')
+TRAILING_COMMA_PATTERN = re.compile(r',\s*$')
+SPACES_PATTERN = re.compile(r'\s+')
+
+NAME_REPLACEMENTS = [
+    ('IEEE International', 'IEEE'),
+    ('ACM International', 'ACM'),
+    ('International Conference', 'Conference'),
+    ('Proceedings of the', ''),
+    ('Proceedings', 'Conference')
+]
+
+NON_NAME_PATTERN = re.compile('|'.join([
+    r'^Foi\s+incorporad',
+    r'^Merged\s+with',
+    r'^Now\s+called',
+    r'^See\s+also',
+    r'^Renamed\s+to',
+    r'^\d{4}$',
+    r'^H5\s+\d+',
+    r'^Impact\s+Factor'
+]), re.IGNORECASE)
+
+TYPO_FIXES = {
+    'Workshp': 'Workshop',
+    'Conferece': 'Conference',
+    'Internation ': 'International ',
+    'Compuer': 'Computer',
+    'Symposim': 'Symposium',
+    'Proccedings': 'Proceedings',
+    'Intelligene': 'Intelligence'
+}
+
+CORRUPTION_PATTERN = re.compile('|'.join(re.escape(indicator) for indicator in [
+    'RoboCup', 'Computer on The Beach', 'Workshop on Tractable',
+    'International Conference of the Italian', 'International Conference on Neural',
+    'https://', 'http://', '.org/', '.com/'
+]))
+
+# alternatives kept per conference and kind (acronyms, names); None keeps all distinct ones
+MAX_ALTERNATIVES = 2
+
+@lru_cache(maxsize=None)
 def normalize_conference_name(name):
     if not name:
         return ""
 
-    name = re.sub(r'https?://[^\s]+', '', name)
-    name = re.sub(r'\([^)]*\)', '', name)
-    name = re.sub(r',\s*$', '', name)
-    name = re.sub(r'\s+', ' ', name)
+    name = URL_PATTERN.sub('', name)
+    name = PARENTHESES_PATTERN.sub('', name)
+    name = TRAILING_COMMA_PATTERN.sub('', name)
+    name = SPACES_PATTERN.sub(' ', name)
     name = name.strip()
 
-    name = name.replace('IEEE International', 'IEEE')
-    name = name.replace('ACM International', 'ACM')
-    name = name.replace('International Conference', 'Conference')
-    name = name.replace('Proceedings of the', '')
-    name = name.replace('Proceedings', 'Conference')
+    for old, new in NAME_REPLACEMENTS:
+        name = name.replace(old, new)
 
     return name.strip()
 
+@lru_cache(maxsize=None)
+def name_tokens(name):
+    normalized = normalize_conference_name(name).lower()
+    return normalized, frozenset(normalized.split())
+
+def jaccard_above(words1, words2, threshold=0.7):
+    common = len(words1 & words2)
+    total = len(words1) + len(words2) - common
+    return total > 0 and common / total > threshold
+
 def are_names_similar(name1, name2):
     if not name1 or not name2:
         return False
 
-    n1 = normalize_conference_name(name1).lower()
-    n2 = normalize_conference_name(name2).lower()
+    n1, words1 = name_tokens(name1)
+    n2, words2 = name_tokens(name2)
 
     if n1 == n2:
         return True
@@ -395,15 +585,127 @@ def are_names_similar(name1, name2):
     if n1 in n2 or n2 in n1:
         return True
 
-    words1 = set(n1.split())
-    words2 = set(n2.split())
-    common = len(words1 & words2)
-    total = len(words1 | words2)
+    return jaccard_above(words1, words2)
+
+# Index of accepted names answering "is this name similar to any of them?"
+# (same test as are_names_similar) without comparing against every name:
+# - exact: normalized forms
+# - tokens: word -> names, candidates for the Jaccard test
+# - grams / prefixes: every GRAM_SIZE-character slice and the first slice of each
+#   name; a substring match of length >= GRAM_SIZE always shares one of them
+# Names whose normalized form is shorter than GRAM_SIZE are checked one by one.
+GRAM_SIZE = 5
+
+def new_name_index():
+    return {'names': [], 'exact': set(), 'tokens': {}, 'grams': {}, 'prefixes': {}, 'short': []}
+
+def add_to_name_index(index, name):
+    normalized, words = name_tokens(name)
+    index['names'].append(name)
+    index['exact'].add(normalized)
+    for word in words:
+        index['tokens'].setdefault(word, []).append(name)
+    if len(normalized) < GRAM_SIZE:
+        index['short'].append(name)
+        return
+    for i in range(len(normalized) - GRAM_SIZE + 1):
+        index['grams'].setdefault(normalized[i:i + GRAM_SIZE], []).append(name)
+    index['prefixes'].setdefault(normalized[:GRAM_SIZE], []).append(name)
 
-    if total > 0 and common / total > 0.7:
+def has_similar_name(index, name):
+    if not name:
+        return False
+    normalized, words = name_tokens(name)
+    if normalized in index['exact']:
         return True
 
-    return False
+    if len(normalized) < GRAM_SIZE:
+        # a short name may be contained in any indexed name
+        return any(are_names_similar(name, other) for other in index['names'])
+
+    candidates = set(index['short'])
+    candidates.update(index['grams'].get(normalized[:GRAM_SIZE], []))
+    for i in range(len(normalized) - GRAM_SIZE + 1):
+        candidates.update(index['prefixes'].get(normalized[i:i + GRAM_SIZE], []))
+    for word in words:
+        candidates.update(index['tokens'].get(word, []))
+
+    return any(are_names_similar(name, other) for other in candidates)
+
+# Near-duplicate conferences across the catalog: names whose normalized word
+# sets have Jaccard > NEAR_DUPLICATE_THRESHOLD (the word test of are_names_similar;
+# its substring test would link "Conference on Information Systems" to every
+# more specific name in the catalog).
+#
+# Blocking (prefix filtering): words are ordered from rarest to most common.
+# Two names above the threshold share at least int(threshold * len) + 1 words,
+# so the two rarest shared words are both within the first
+# len - int(threshold * len) + 1 words of each name. Every pair of words from
+# that prefix is a blocking key, and a name is only compared with the earlier
+# names indexed under one of its keys (and with a compatible size). Single-word
+# names can only match the same word, which is their key. Keys shared by more
+# than MAX_BLOCK_SIZE names are not probed, so the number of comparisons stays
+# close to linear in the catalog size.
+NEAR_DUPLICATE_THRESHOLD = 0.7
+MAX_BLOCK_SIZE = 500
+MAX_REPORTED_CLUSTERS = 20
+
+def near_duplicate_clusters(conf_df, threshold=NEAR_DUPLICATE_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+    names = [name if isinstance(name, str) else '' for name in conf_df['name']]
+    words = [name_tokens(name)[1] for name in names]
+
+    frequency = {}
+    for name_words in words:
+        for word in name_words:
+            frequency[word] = frequency.get(word, 0) + 1
+
+    index = {}
+    similar = {}
+    for pos, name_words in enumerate(words):
+        if not name_words:
+            continue
+        size = len(name_words)
+        rarest = sorted(name_words, key=lambda word: (frequency[word], word))
+        if size == 1:
+            keys = [tuple(rarest)]
+        else:
+            keys = list(combinations(rarest[:size - int(threshold * size) + 1], 2))
+
+        candidates = set()
+        for word in keys:
+            block = index.get(word, [])
+            if len(block) <= max_block_size:
+                candidates.update(block)
+        for other in candidates:
+            other_words = words[other]
+            if not threshold * size < len(other_words) < size / threshold:
+                continue
+            common = len(name_words & other_words)
+            score = common / (size + len(other_words) - common)
+            if score > threshold:
+                similar[(other, pos)] = score
+
+        for word in keys:
+            index.setdefault(word, []).append(pos)
+
+    groups = resolve_groups(list(similar))
+    root_of = {row: root for root, members in groups.items() for row in [root] + members}
+    pair_scores = {}
+    for pair, score in similar.items():
+        pair_scores.setdefault(root_of[pair[0]], []).append(score)
+
+    # clusters ranked by mean pair similarity: long chains of related names rank below true duplicates
+    cs_ids = conf_df['cs_id'].to_numpy()
+    acronyms = conf_df['acronym'].to_numpy()
+    clusters = []
+    for root, members in groups.items():
+        rows = sorted([root] + members)
+        clusters.append({
+            'score': round(sum(pair_scores[root]) / len(pair_scores[root]), 3),
+            'members': [{'cs_id': int(cs_ids[row]), 'acronym': acronyms[row], 'name': names[row]} for row in rows]
+        })
+    clusters.sort(key=lambda cluster: (-cluster['score'], -len(cluster['members']), cluster['members'][0]['cs_id']))
+    return clusters
 
 def is_valid_conference_name(name):
     if not name or len(name) < 3:
@@ -416,35 +718,13 @@ def is_valid_conference_name(name):
         if name[-1] in '(),.' and len(name) > 1:
             return is_valid_conference_name(name[:-1])
 
-    non_name_patterns = [
-        r'^Foi\s+incorporad',
-        r'^Merged\s+with',
-        r'^Now\s+called',
-        r'^See\s+also',
-        r'^Renamed\s+to',
-        r'^\d{4}$',
-        r'^H5\s+\d+',
-        r'^Impact\s+Factor'
-    ]
-
-    for pattern in non_name_patterns:
-        if re.match(pattern, name, re.IGNORECASE):
-            return False
+    if NON_NAME_PATTERN.match(name):
+        return False
 
     return True
 
 def fix_common_typos(name):
-    typo_fixes = {
-        'Workshp': 'Workshop',
-        'Conferece': 'Conference',
-        'Internation ': 'International ',
-        'Compuer': 'Computer',
-        'Symposim': 'Symposium',
-        'Proccedings': 'Proceedings',
-        'Intelligene': 'Intelligence'
-    }
-
-    for typo, fix in typo_fixes.items():
+    for typo, fix in TYPO_FIXES.items():
         name = name.replace(typo, fix)
 
     return name
@@ -453,20 +733,13 @@ def preprocess_alternative_names(names_str, base_name, sigla):
     if not names_str or pd.isna(names_str):
         return []
 
-    corruption_indicators = [
-        'RoboCup', 'Computer on The Beach', 'Workshop on Tractable',
-        'International Conference of the Italian', 'International Conference on Neural',
-        'https://', 'http://', '.org/', '.com/'
-    ]
-
     names_text = str(names_str)
-    for indicator in corruption_indicators:
-        if indicator in names_text:
-            print(f"  Warning: Skipping corrupted alternatives for {sigla}")
-            return []
+    if CORRUPTION_PATTERN.search(names_text):
+        print(f"  Warning: Skipping corrupted alternatives for {sigla}")
+        return []
 
     names = []
-    seen_normalized = set()
+    accepted = new_name_index()
 
     for name in names_text.split('|'):
         name = name.strip()
@@ -483,243 +756,537 @@ def preprocess_alternative_names(names_str, base_name, sigla):
         if not normalized or len(normalized) < 5:
             continue
 
-        norm_lower = normalized.lower()
-        if norm_lower in seen_normalized:
-            continue
-
-        is_duplicate = False
-        for seen_name in names:
-            if are_names_similar(name, seen_name):
-                is_duplicate = True
-                break
-
-        if not is_duplicate and not are_names_similar(name, base_name):
+        if not has_similar_name(accepted, name) and not are_names_similar(name, base_name):
             names.append(name)
-            seen_normalized.add(norm_lower)
+            add_to_name_index(accepted, name)
 
-            if len(names) >= 2:
+            if MAX_ALTERNATIVES and len(names) >= MAX_ALTERNATIVES:
                 break
 
     return names
 
 def create_additional_names_csv(df):
-    additional = []
-    aid = 1
+    cs_ids = []
+    names = []
+    acronyms = []
     total_removed = 0
     total_original = 0
 
-    for idx, row in df.iterrows():
-        cs_id = extract_numeric_id(row['comp_id'])
-
-        if row['siglas_alt'] and not pd.isna(row['siglas_alt']):
-            original_count = len(str(row['siglas_alt']).split('|'))
+    columns = zip(extract_numeric_ids(df['comp_id']), df['sigla'], df['nome'], df['siglas_alt'], df['nomes_alt'])
+    for cs_id, sigla, nome, siglas_alt, nomes_alt in columns:
+        if siglas_alt and not pd.isna(siglas_alt):
+            original_count = len(str(siglas_alt).split('|'))
             total_original += original_count
 
-            clean_acronyms = preprocess_alternative_names(
-                row['siglas_alt'],
-                row['sigla'],
-                row['sigla']
-            )
-
-            for alt in clean_acronyms[:2]:
-                additional.append({
-                    'additional_name_id': aid,
-                    'cs_id': cs_id,
-                    'additional_name': '',
-                    'additional_acronym': alt
-                })
-                aid += 1
+            clean_acronyms = preprocess_alternative_names(siglas_alt, sigla, sigla)
+            for alt in clean_acronyms[:MAX_ALTERNATIVES]:
+                cs_ids.append(cs_id)
+                names.append('')
+                acronyms.append(alt)
 
             total_removed += original_count - len(clean_acronyms)
 
-        if row['nomes_alt'] and not pd.isna(row['nomes_alt']):
-            original_count = len(str(row['nomes_alt']).split('|'))
+        if nomes_alt and not pd.isna(nomes_alt):
+            original_count = len(str(nomes_alt).split('|'))
             total_original += original_count
 
-            clean_names = preprocess_alternative_names(
-                row['nomes_alt'],
-                row['nome'],
-                row['sigla']
-            )
-
-            for alt in clean_names[:2]:
-                additional.append({
-                    'additional_name_id': aid,
-                    'cs_id': cs_id,
-                    'additional_name': alt,
-                    'additional_acronym': ''
-                })
-                aid += 1
+            clean_names = preprocess_alternative_names(nomes_alt, nome, sigla)
+            for alt in clean_names[:MAX_ALTERNATIVES]:
+                cs_ids.append(cs_id)
+                names.append(alt)
+                acronyms.append('')
 
             total_removed += original_count - len(clean_names)
 
+    additional = pd.DataFrame({
+        'additional_name_id': np.arange(1, len(cs_ids) + 1),
+        'cs_id': np.array(cs_ids, dtype='int64'),
+        'additional_name': names,
+        'additional_acronym': acronyms
+    })
+
     if total_original > 0:
         print(f"  Alternative names: {total_original} -> {len(additional)} (removed {total_removed} duplicates/corrupted)")
 
-    return pd.DataFrame(additional)
+    return additional
 
 def create_editions_csv(df):
-    editions = []
-    eid = 1
     timestamp = datetime.now().isoformat()
 
-    for idx, row in df.iterrows():
-        cs_id = extract_numeric_id(row['comp_id'])
-
-        year = None
-        if row['ano_dados'] and not pd.isna(row['ano_dados']):
-            try:
-                year = int(float(row['ano_dados']))
-            except:
-                year = None
-
-        if year and year > 2000 and year < 2030:
-            editions.append({
-                'edition_id': eid,
-                'cs_id': cs_id,
-                'name': row['nome'],
-                'acronym': row['sigla'],
-                'society': row['sociedade'] if row['sociedade'] and not pd.isna(row['sociedade']) else '',
-                'year': year,
-                'total_citations': 0,
-                'total_papers': 0,
-                'h5_index': None,
-                'isbn': '',
-                'doi': '',
-                'extended_issn': '',
-                'id_springer': '',
-                'id_scholar_conference': row['gs_id'] if row['gs_id'] and not pd.isna(row['gs_id']) else '',
-                'id_dblp_conference': row['dblp_id'] if row['dblp_id'] and not pd.isna(row['dblp_id']) else '',
-                'id_openalex_proceedings': '',
-                'created_at': timestamp
-            })
-            eid += 1
+    years = pd.to_numeric(df['ano_dados'].where(has_value(df['ano_dados'])), errors='coerce')
+    years = np.trunc(years.to_numpy(dtype=float))
+    in_range = (years > 2000) & (years < 2030)
+    selected = df[in_range]
+
+    editions = pd.DataFrame({
+        'edition_id': np.arange(1, len(selected) + 1),
+        'cs_id': extract_numeric_ids(selected['comp_id']),
+        'name': selected['nome'].to_numpy(),
+        'acronym': selected['sigla'].to_numpy(),
+        'society': blank_if_missing(selected['sociedade']),
+        'year': years[in_range].astype('int64'),
+        'total_citations': 0,
+        'total_papers': 0,
+        'h5_index': None,
+        'isbn': '',
+        'doi': '',
+        'extended_issn': '',
+        'id_springer': '',
+        'id_scholar_conference': blank_if_missing(selected['gs_id']),
+        'id_dblp_conference': blank_if_missing(selected['dblp_id']),
+        'id_openalex_proceedings': '',
+        'created_at': timestamp
+    })
+
+    return editions
+
+# Quality metrics: every check of the quality report and of validate_data,
+# computed once from the merged and normalized tables with column operations.
+# The same dict is printed as the quality report and written to
+# QUALITY_REPORT_FILE, so dashboards can track it without parsing the log.
+QUALITY_REPORT_FILE = 'quality_report.json'
+MAX_CONFERENCES = 1650
+
+def coverage(series, total):
+    count = int(has_value(series).sum())
+    return {'count': count, 'total': total, 'percent': round(count * 100 / total, 1) if total else 0.0}
+
+def orphan_count(df, conf_ids):
+    if len(df) == 0:
+        return 0
+    return int(df.loc[~df['cs_id'].isin(conf_ids), 'cs_id'].nunique())
+
+def quality_metrics(merged_df, conf_df, add_df, ed_df, config, rename_rules):
+    total_merged = len(merged_df)
+    comp_prefix = merged_df['comp_id'].str[:7]
+
+    acronym_counts = conf_df['acronym'].value_counts().sort_index()
+    acronym_counts = acronym_counts[acronym_counts > 1]
 
-    return pd.DataFrame(editions)
+    unifications = {}
+    for unified_name, info in rename_rules.get('unifications', {}).items():
+        if isinstance(info, dict) and info.get('absorbs'):
+            unifications[unified_name] = info['absorbs']
+    qualis_removed = {}
+    for sigla, info in rename_rules.get('qualis_duplicates', {}).get('unify', {}).items():
+        if info.get('remove'):
+            qualis_removed[sigla] = info['remove']
 
-def generate_quality_report(merged_df, conf_df, add_df, ed_df, config, rename_rules):
+    total_confs = len(conf_df)
+    expected_min = config['expected_results']['min_conferences']
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'comp_ids': {
+            'qualis': int((comp_prefix == 'CompID9').sum()),
+            'ce': int((comp_prefix == 'CompID8').sum())
+        },
+        'coverage': {
+            'gs_id': coverage(merged_df['gs_id'], total_merged),
+            'dblp_id': coverage(merged_df['dblp_id'], total_merged),
+            'top': coverage(merged_df['avaliacao'], total_merged)
+        },
+        'duplicates': {
+            'acronyms': {acronym: int(count) for acronym, count in acronym_counts.items()},
+            'extra_rows': int(conf_df['acronym'].duplicated().sum()),
+            'near_duplicate_names': near_duplicate_clusters(conf_df)
+        },
+        'unifications': unifications,
+        'qualis_duplicates_removed': qualis_removed,
+        'integrity': {
+            'empty_names': int((conf_df['name'] == '').sum()),
+            'empty_acronyms': int((conf_df['acronym'] == '').sum()),
+            'orphan_additional_names': orphan_count(add_df, conf_df['cs_id']),
+            'orphan_editions': orphan_count(ed_df, conf_df['cs_id'])
+        },
+        'expectations': {
+            'total_conferences': total_confs,
+            'min_conferences': expected_min,
+            'max_conferences': MAX_CONFERENCES,
+            'within_range': bool(expected_min <= total_confs <= MAX_CONFERENCES)
+        },
+        'tables': {
+            'conferences': total_confs,
+            'additional_names': len(add_df),
+            'editions': len(ed_df)
+        }
+    }
+
+def save_quality_report(metrics, output_dir):
+    with open(os.path.join(output_dir, QUALITY_REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2, ensure_ascii=False)
+
+def generate_quality_report(metrics):
     print("\n" + "="*60)
     print("QUALITY REPORT")
     print("="*60)
 
-    comp9_count = sum(1 for x in merged_df['comp_id'] if x.startswith('CompID9'))
-    comp8_count = sum(1 for x in merged_df['comp_id'] if x.startswith('CompID8'))
-
     print("\n1. CompID Distribution:")
-    print(f"   CompID9xxxxx (Qualis): {comp9_count}")
-    print(f"   CompID8xxxxx (CEs new): {comp8_count}")
+    print(f"   CompID9xxxxx (Qualis): {metrics['comp_ids']['qualis']}")
+    print(f"   CompID8xxxxx (CEs new): {metrics['comp_ids']['ce']}")
 
     print("\n2. Data Coverage:")
-    gs_coverage = sum(1 for x in merged_df['gs_id'] if x and not pd.isna(x))
-    dblp_coverage = sum(1 for x in merged_df['dblp_id'] if x and not pd.isna(x))
-    top_coverage = sum(1 for x in merged_df['avaliacao'] if x and not pd.isna(x))
-
-    print(f"   Google Scholar IDs: {gs_coverage}/{len(merged_df)} ({gs_coverage*100/len(merged_df):.1f}%)")
-    print(f"   DBLP IDs: {dblp_coverage}/{len(merged_df)} ({dblp_coverage*100/len(merged_df):.1f}%)")
-    print(f"   TOP classification: {top_coverage}/{len(merged_df)} ({top_coverage*100/len(merged_df):.1f}%)")
+    for label, key in [('Google Scholar IDs', 'gs_id'), ('DBLP IDs', 'dblp_id'), ('TOP classification', 'top')]:
+        item = metrics['coverage'][key]
+        print(f"   {label}: {item['count']}/{item['total']} ({item['count']*100/item['total']:.1f}%)")
 
     print("\n3. Duplicates Analysis:")
-    dup_df = conf_df[conf_df['acronym'].duplicated(keep=False)].sort_values('acronym')
-    if len(dup_df) > 0:
-        print(f"   Found {len(dup_df.groupby('acronym'))} duplicate acronyms:")
-        for acronym in dup_df['acronym'].unique():
-            count = len(dup_df[dup_df['acronym'] == acronym])
+    duplicate_acronyms = metrics['duplicates']['acronyms']
+    if duplicate_acronyms:
+        print(f"   Found {len(duplicate_acronyms)} duplicate acronyms:")
+        for acronym, count in duplicate_acronyms.items():
             print(f"     - {acronym}: {count} occurrences")
     else:
         print("   No duplicates found!")
 
     print("\n4. Unifications Applied:")
-    unifications = rename_rules.get('unifications', {})
-    for unified_name, info in unifications.items():
-        if isinstance(info, dict):
-            absorbed = info.get('absorbs', [])
-            if absorbed:
-                print(f"   {unified_name} <- {', '.join(absorbed)}")
+    for unified_name, absorbed in metrics['unifications'].items():
+        print(f"   {unified_name} <- {', '.join(absorbed)}")
 
     print("\n5. Qualis Duplicates Removed:")
-    qualis_dups = rename_rules.get('qualis_duplicates', {}).get('unify', {})
-    for sigla, info in qualis_dups.items():
-        removed = info.get('remove', [])
-        if removed:
-            print(f"   {sigla}: removed {', '.join(removed)}")
+    for sigla, removed in metrics['qualis_duplicates_removed'].items():
+        print(f"   {sigla}: removed {', '.join(removed)}")
 
     print("\n6. Data Quality Metrics:")
-    empty_names = conf_df[conf_df['name'] == ''].shape[0]
-    empty_acronyms = conf_df[conf_df['acronym'] == ''].shape[0]
-
-    print(f"   Empty names: {empty_names}")
-    print(f"   Empty acronyms: {empty_acronyms}")
-    print(f"   Orphan additional names: {len(set(add_df['cs_id']) - set(conf_df['cs_id'])) if len(add_df) > 0 else 0}")
-    print(f"   Orphan editions: {len(set(ed_df['cs_id']) - set(conf_df['cs_id'])) if len(ed_df) > 0 else 0}")
+    integrity = metrics['integrity']
+    print(f"   Empty names: {integrity['empty_names']}")
+    print(f"   Empty acronyms: {integrity['empty_acronyms']}")
+    print(f"   Orphan additional names: {integrity['orphan_additional_names']}")
+    print(f"   Orphan editions: {integrity['orphan_editions']}")
 
     print("\n7. Expectations Check:")
-    expected_min = config['expected_results']['min_conferences']
-    total_confs = len(conf_df)
-
-    if total_confs >= expected_min and total_confs <= 1650:
-        print(f"   [OK] Total conferences ({total_confs}) within expected range ({expected_min}-1650)")
+    expectations = metrics['expectations']
+    expected_range = f"{expectations['min_conferences']}-{expectations['max_conferences']}"
+    if expectations['within_range']:
+        print(f"   [OK] Total conferences ({expectations['total_conferences']}) within expected range ({expected_range})")
+    else:
+        print(f"   [FAIL] Total conferences ({expectations['total_conferences']}) outside expected range ({expected_range})")
+
+    print("\n8. Near-duplicate Names:")
+    clusters = metrics['duplicates']['near_duplicate_names']
+    if clusters:
+        print(f"   Found {len(clusters)} clusters of similar names (top {min(len(clusters), MAX_REPORTED_CLUSTERS)}):")
+        for cluster in clusters[:MAX_REPORTED_CLUSTERS]:
+            print(f"     - [{cluster['score']:.2f}] {', '.join(member['acronym'] for member in cluster['members'])}")
+            for member in cluster['members']:
+                print(f"         {member['cs_id']} {member['acronym']}: {member['name']}")
     else:
-        print(f"   [FAIL] Total conferences ({total_confs}) outside expected range ({expected_min}-1650)")
+        print("   No near-duplicate names found!")
 
     print("\n" + "="*60)
 
-def validate_data(conf_df, add_df, ed_df, config):
+def validate_data(metrics):
     errors = []
     warnings = []
 
-    conf_ids = set(conf_df['cs_id'])
-    add_ids = set(add_df['cs_id']) if len(add_df) > 0 else set()
-    ed_ids = set(ed_df['cs_id']) if len(ed_df) > 0 else set()
+    integrity = metrics['integrity']
+    if integrity['orphan_additional_names']:
+        errors.append(f"Orphan records in additional_names: {integrity['orphan_additional_names']}")
 
-    orphan_add = add_ids - conf_ids
-    if orphan_add:
-        errors.append(f"Orphan records in additional_names: {len(orphan_add)}")
+    if integrity['orphan_editions']:
+        errors.append(f"Orphan records in editions: {integrity['orphan_editions']}")
 
-    orphan_ed = ed_ids - conf_ids
-    if orphan_ed:
-        errors.append(f"Orphan records in editions: {len(orphan_ed)}")
+    if integrity['empty_names'] > 0:
+        errors.append(f"Conferences with empty names: {integrity['empty_names']}")
 
-    empty_names = conf_df[conf_df['name'] == ''].shape[0]
-    if empty_names > 0:
-        errors.append(f"Conferences with empty names: {empty_names}")
+    if integrity['empty_acronyms'] > 0:
+        errors.append(f"Conferences with empty acronyms: {integrity['empty_acronyms']}")
 
-    empty_acronyms = conf_df[conf_df['acronym'] == ''].shape[0]
-    if empty_acronyms > 0:
-        errors.append(f"Conferences with empty acronyms: {empty_acronyms}")
-
-    dup_acronyms = conf_df[conf_df['acronym'].duplicated()].shape[0]
+    dup_acronyms = metrics['duplicates']['extra_rows']
     if dup_acronyms > 0:
         warnings.append(f"Duplicate acronyms: {dup_acronyms}")
-        dup_list = conf_df[conf_df['acronym'].duplicated(keep=False)].sort_values('acronym')
         print("  Duplicates found:")
-        for acronym in dup_list['acronym'].unique()[:10]:
+        for acronym in list(metrics['duplicates']['acronyms'])[:10]:
             print(f"    - {acronym}")
 
-    total_confs = len(conf_df)
-    expected_min = config['expected_results']['min_conferences']
-    if total_confs < expected_min:
-        warnings.append(f"Total conferences ({total_confs}) below expected minimum ({expected_min})")
+    expectations = metrics['expectations']
+    total_confs = expectations['total_conferences']
+    if total_confs < expectations['min_conferences']:
+        warnings.append(f"Total conferences ({total_confs}) below expected minimum ({expectations['min_conferences']})")
 
-    if total_confs > 1650:
+    if total_confs > expectations['max_conferences']:
         warnings.append(f"Total conferences ({total_confs}) seems high, check for issues")
 
     return errors, warnings
 
-def main():
+# Incremental rebuild (--incremental)
+#
+# A manifest in CATALOG_CACHE_DIR records the digest of every input (Qualis,
+# CE files, rename_rules.json, config, this script, and for conferences.db
+# export_sqlite.py and the out/website-<year>.csv h5 results). When nothing changed
+# since the last build the run stops early. Otherwise only the changed inputs
+# are parsed again: the processed Qualis table and each parsed CE file are
+# cached by digest. The merge itself runs again, since CompID8 numbering
+# depends on the order of all CE files, and the new tables are compared with
+# the previous outputs: unchanged rows keep their timestamps and the
+# differences are written to catalog_changelog.csv. Since a CE row added or
+# removed shifts the CompID8 of the rows after it, old and new conferences are
+# matched on (acronym, name), not on cs_id; a conference whose cs_id changed
+# is reported as 'renumbered' (with its previous_key), not as modified.
+CACHE_DIR = os.environ.get('CSCONFS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+CATALOG_CACHE_DIR = os.path.join(CACHE_DIR, 'catalog')
+MANIFEST_PATH = os.path.join(CATALOG_CACHE_DIR, 'manifest.json')
+OUTPUT_FILES = ['conferences.csv', 'conference_additional_names.csv', 'conference_editions.csv', 'merged_conferences.csv',
+                QUALITY_REPORT_FILE, DB_FILE]
+CHANGELOG_FILE = 'catalog_changelog.csv'
+
+# key columns and compared columns of each output table
+CHANGELOG_TABLES = {
+    'conferences.csv': (['cs_id'], ['name', 'acronym']),
+    'conference_editions.csv': (['cs_id', 'year'], ['name', 'acronym', 'society', 'id_scholar_conference', 'id_dblp_conference']),
+    'conference_additional_names.csv': (['cs_id', 'additional_name', 'additional_acronym'], [])
+}
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def input_digests(config, ce_files, output_dir):
+    return {
+        'code': file_digest(os.path.abspath(__file__)),
+        'export_code': file_digest(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'export_sqlite.py')),
+        'config': hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest(),
+        'rename_rules': file_digest(RULES_PATH),
+        'qualis': file_digest(qualis_path(config)),
+        'ce_files': {os.path.basename(path): file_digest(path) for path in sorted(ce_files)},
+        'h5_files': {os.path.basename(path): file_digest(path) for path in find_h5_files(output_dir)}
+    }
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(digests):
+    os.makedirs(CATALOG_CACHE_DIR, exist_ok=True)
+    tmp = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'inputs': digests, 'built_at': datetime.now().isoformat()}, f, indent=2)
+    os.replace(tmp, MANIFEST_PATH)
+
+def changed_inputs(previous, current):
+    changed = [name for name in ['code', 'export_code', 'config', 'rename_rules', 'qualis']
+               if previous.get(name) != current[name]]
+    for files in ['ce_files', 'h5_files']:
+        previous_files = previous.get(files, {})
+        for name in sorted(set(previous_files) | set(current[files])):
+            if previous_files.get(name) != current[files].get(name):
+                changed.append(name)
+    return changed
+
+def cache_entry_path(name):
+    return os.path.join(CATALOG_CACHE_DIR, hashlib.sha1(name.encode('utf-8')).hexdigest() + '.pkl')
+
+def read_cached(name, digest):
+    try:
+        with open(cache_entry_path(name), 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return entry['data'] if entry.get('digest') == digest else None
+
+def write_cached(name, digest, data):
+    os.makedirs(CATALOG_CACHE_DIR, exist_ok=True)
+    path = cache_entry_path(name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump({'digest': digest, 'data': data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+def load_qualis_incremental(config, rename_rules, digests):
+    digest = digests['qualis'] + digests['rename_rules'] + digests['code']
+    qualis_df = read_cached('qualis', digest)
+    if qualis_df is not None:
+        return qualis_df, True
+    qualis_df = process_qualis(load_qualis(config), rename_rules)
+    write_cached('qualis', digest, qualis_df)
+    return qualis_df, False
+
+def read_ce_files_incremental(ce_files, digests, max_workers=None):
+    def digest_of(path):
+        return digests['ce_files'][os.path.basename(path)] + digests['code']
+
+    ce_data_list = [read_cached(path, digest_of(path)) for path in ce_files]
+    pending = [pos for pos, data in enumerate(ce_data_list) if data is None]
+    if pending:
+        parsed = read_ce_files([ce_files[pos] for pos in pending], max_workers)
+        for pos, data in zip(pending, parsed):
+            write_cached(ce_files[pos], digest_of(ce_files[pos]), data)
+            ce_data_list[pos] = data
+    return ce_data_list, len(pending)
+
+def as_written(df):
+    # the table as it reads back from its CSV file
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), dtype=str, keep_default_na=False)
+
+def read_previous_outputs(output_dir):
+    previous = {}
+    for name in CHANGELOG_TABLES:
+        path = os.path.join(output_dir, name)
+        if os.path.exists(path):
+            previous[name] = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return previous
+
+def conference_id_map(previous, current):
+    # previous cs_id -> current cs_id, matching conferences on (acronym, name) and
+    # repeated pairs in order of appearance; conferences left unmatched on both
+    # sides keep their cs_id (a real name/acronym change of a stable id)
+    if previous is None or current is None:
+        return {}
+
+    def stable_keys(df):
+        occurrence = df.groupby(['acronym', 'name']).cumcount()
+        return list(zip(df['acronym'], df['name'], occurrence))
+
+    current_ids = dict(zip(stable_keys(current), current['cs_id']))
+    id_map = {}
+    for key, old_id in zip(stable_keys(previous), previous['cs_id']):
+        if key in current_ids:
+            id_map[old_id] = current_ids[key]
+    taken = set(id_map.values())
+    unmatched = set(current['cs_id']) - taken
+    for old_id in previous['cs_id']:
+        if old_id not in id_map and old_id in unmatched:
+            id_map[old_id] = old_id
+    return id_map
+
+def remap_previous(table, id_map):
+    # previous rows in the current cs_id numbering (old id kept in previous_cs_id),
+    # and the rows of conferences that no longer exist
+    mapped = table['cs_id'].map(id_map)
+    gone = table[mapped.isna()]
+    table = table[mapped.notna()].copy()
+    table['previous_cs_id'] = table['cs_id']
+    table['cs_id'] = mapped[mapped.notna()]
+    return table, gone
+
+def key_text(key):
+    return '|'.join(key) if isinstance(key, tuple) else str(key)
+
+def table_changes(name, previous, current, id_map):
+    keys, fields = CHANGELOG_TABLES[name]
+    mapped, gone = remap_previous(previous, id_map)
+    before = mapped.drop_duplicates(keys).set_index(keys)
+    after = current.drop_duplicates(keys).set_index(keys)
+
+    def previous_key(key):
+        old_id = before.loc[key, 'previous_cs_id']
+        if len(keys) == 1:
+            return old_id
+        return tuple(old_id if col == 'cs_id' else part for col, part in zip(keys, key))
+
+    changes = []
+    for key in after.index.difference(before.index):
+        changes.append((name, key, 'added', '', ''))
+    for key in before.index.difference(after.index):
+        changes.append((name, previous_key(key), 'removed', '', ''))
+    for key in gone.drop_duplicates(keys).set_index(keys).index:
+        changes.append((name, key, 'removed', '', ''))
+    common = after.index.intersection(before.index)
+    if len(common) > 0:
+        cs_ids = common.get_level_values('cs_id') if len(keys) > 1 else common
+        renumbered = before.loc[common, 'previous_cs_id'].to_numpy() != cs_ids.to_numpy()
+        for key in common[renumbered]:
+            changes.append((name, key, 'renumbered', 'cs_id', key_text(previous_key(key))))
+    if fields and len(common) > 0:
+        differs = after.loc[common, fields].ne(before.loc[common, fields])
+        for key, row in differs[differs.any(axis=1)].iterrows():
+            changes.append((name, key, 'modified', '|'.join(row.index[row.to_numpy()]), ''))
+    return changes
+
+def build_changelog(previous, current, id_map):
+    changes = []
+    for name, table in current.items():
+        if name in previous:
+            changes.extend(table_changes(name, previous[name], table, id_map))
+        else:
+            changes.extend(table_changes(name, table.iloc[0:0], table, id_map))
+
+    return pd.DataFrame(
+        [(name, key_text(key), change, fields, previous_key) for name, key, change, fields, previous_key in changes],
+        columns=['table', 'key', 'change', 'fields', 'previous_key']
+    )
+
+def keep_timestamps(name, table, previous, changelog, id_map):
+    # rows that already existed keep created_at; unchanged rows also keep updated_at
+    if name not in previous or len(table) == 0:
+        return table
+    keys, _ = CHANGELOG_TABLES[name]
+    written = as_written(table)
+    key = written[keys].agg('|'.join, axis=1) if len(keys) > 1 else written[keys[0]]
+    before, _ = remap_previous(previous[name], id_map)
+    before_key = before[keys].agg('|'.join, axis=1) if len(keys) > 1 else before[keys[0]]
+    changed = changelog.loc[(changelog['table'] == name) & changelog['change'].isin(['modified', 'renumbered']), 'key']
+
+    table = table.copy()
+    for col in ['created_at', 'updated_at']:
+        if col not in table.columns or col not in before.columns:
+            continue
+        old_values = key.map(dict(zip(before_key, before[col])))
+        keep = old_values.notna()
+        if col == 'updated_at':
+            keep &= ~key.isin(set(changed))
+        table[col] = old_values.where(keep, table[col].reset_index(drop=True)).to_numpy()
+    return table
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the normalized conference database CSVs')
+    parser.add_argument('--incremental', action='store_true',
+                        help='reuse unchanged inputs and write catalog_changelog.csv')
+    args = parser.parse_args(argv)
+
     config = load_config()
     rename_rules = load_rename_rules()
+    rule_index = compile_rename_rules(rename_rules)
+    for warning in rule_index['warnings']:
+        print(f"  Rename rule warning: {warning}")
+    if rule_index['errors']:
+        print("Rename rule ERRORS:")
+        for error in rule_index['errors']:
+            print(f"  ERROR: {error}")
+        print("\nStopping due to rename rule errors")
+        return
+    output_dir = os.path.join(os.path.dirname(__file__), '..', 'out')
+
+    ce_files = load_ce_files(config)
+    digests = None
+    if args.incremental:
+        digests = input_digests(config, ce_files, output_dir)
+        manifest = load_manifest()
+        changed = changed_inputs(manifest.get('inputs', {}), digests)
+        outputs_exist = all(os.path.exists(os.path.join(output_dir, name)) for name in OUTPUT_FILES)
+        if not changed and outputs_exist:
+            print("Inputs unchanged since the last build, nothing to do")
+            return
+        if not manifest:
+            print("No previous build manifest, rebuilding everything\n")
+        else:
+            print(f"Changed inputs: {', '.join(changed) if changed else 'none (outputs missing)'}\n")
 
     print("Step 1: Loading Qualis dataset")
-    qualis_raw = load_qualis(config)
-    qualis_df = process_qualis(qualis_raw, rename_rules)
+    if args.incremental:
+        qualis_df, reused = load_qualis_incremental(config, rename_rules, digests)
+        if reused:
+            print("  Reusing processed Qualis dataset (unchanged)")
+    else:
+        qualis_raw = load_qualis(config)
+        qualis_df = process_qualis(qualis_raw, rename_rules)
     print(f"  Loaded {len(qualis_df)} conferences from Qualis (after removing duplicates)")
 
     print("\nStep 2: Loading CE files")
-    ce_files = load_ce_files(config)
     print(f"  Found {len(ce_files)} CE files")
+    ce_data_list = None
+    if args.incremental:
+        ce_data_list, parsed = read_ce_files_incremental(ce_files, digests)
+        print(f"  Parsed {parsed} changed CE files, reused {len(ce_files) - parsed}")
 
     print("\nStep 3: Merging datasets with rename rules")
-    merged_df = merge_all(qualis_df, ce_files, config, rename_rules)
+    merged_df = merge_all(qualis_df, ce_files, config, rename_rules, ce_data_list, rule_index)
     print(f"  Total after merge: {len(merged_df)} conferences")
 
     print("\nStep 4: Creating normalized tables")
@@ -732,7 +1299,8 @@ def main():
     print(f"  conference_editions.csv: {len(ed_df)} records")
 
     print("\nStep 5: Validating data")
-    errors, warnings = validate_data(conf_df, add_df, ed_df, config)
+    metrics = quality_metrics(merged_df, conf_df, add_df, ed_df, config, rename_rules)
+    errors, warnings = validate_data(metrics)
 
     if errors:
         print("  Validation ERRORS:")
@@ -749,26 +1317,50 @@ def main():
     print("  Validation passed (with warnings)" if warnings else "  Validation passed")
 
     print("\nStep 6: Saving files")
-    output_dir = os.path.join(os.path.dirname(__file__), '..', 'out')
     os.makedirs(output_dir, exist_ok=True)
 
+    if args.incremental:
+        previous = read_previous_outputs(output_dir)
+        tables = {
+            'conferences.csv': conf_df,
+            'conference_additional_names.csv': add_df,
+            'conference_editions.csv': ed_df
+        }
+        current = {name: as_written(df) for name, df in tables.items()}
+        id_map = conference_id_map(previous.get('conferences.csv'), current['conferences.csv'])
+        changelog = build_changelog(previous, current, id_map)
+        conf_df = keep_timestamps('conferences.csv', conf_df, previous, changelog, id_map)
+        ed_df = keep_timestamps('conference_editions.csv', ed_df, previous, changelog, id_map)
+        changelog.to_csv(os.path.join(output_dir, CHANGELOG_FILE), index=False, encoding='utf-8')
+        counts = changelog['change'].value_counts()
+        print(f"  {CHANGELOG_FILE}: {counts.get('added', 0)} added, {counts.get('removed', 0)} removed, "
+              f"{counts.get('modified', 0)} modified, {counts.get('renumbered', 0)} renumbered")
+
     conf_df.to_csv(os.path.join(output_dir, 'conferences.csv'), index=False, encoding='utf-8')
     add_df.to_csv(os.path.join(output_dir, 'conference_additional_names.csv'), index=False, encoding='utf-8')
     ed_df.to_csv(os.path.join(output_dir, 'conference_editions.csv'), index=False, encoding='utf-8')
 
     merged_df.to_csv(os.path.join(output_dir, 'merged_conferences.csv'), index=False, encoding='utf-8', na_rep='')
 
-    gs_count = sum(1 for x in merged_df['gs_id'] if x and not pd.isna(x))
-    dblp_count = sum(1 for x in merged_df['dblp_id'] if x and not pd.isna(x))
+    save_quality_report(metrics, output_dir)
+
+    print("\nStep 7: Exporting SQLite database")
+    h5_files = find_h5_files(output_dir)
+    export_sqlite(conf_df, add_df, ed_df, load_h5_results(h5_files), os.path.join(output_dir, DB_FILE))
+    print(f"  {DB_FILE}: {len(conf_df)} conferences, h5 results from {len(h5_files)} files")
 
     print("\nFinal Summary:")
     print(f"  Total conferences: {len(conf_df)}")
-    print(f"  With GS ID: {gs_count}")
-    print(f"  With DBLP ID: {dblp_count}")
+    print(f"  With GS ID: {metrics['coverage']['gs_id']['count']}")
+    print(f"  With DBLP ID: {metrics['coverage']['dblp_id']['count']}")
     print(f"  Additional names: {len(add_df)}")
     print(f"  Editions: {len(ed_df)}")
 
-    generate_quality_report(merged_df, conf_df, add_df, ed_df, config, rename_rules)
+    generate_quality_report(metrics)
+    print(f"\nQuality metrics written to {QUALITY_REPORT_FILE}")
+
+    if args.incremental:
+        save_manifest(digests)
 
     print("\nDone!")
 
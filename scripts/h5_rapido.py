@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import glob
+import os
+import sys
+import numpy as np
+import vinculo
+from instrumentacao import debug, fase
+from metricas import calcular_metricas_h, detectar_fonte
+
+# Caminho rápido de calc_h5.run_h5_script, sem pandas (somente stdlib + NumPy).
+#
+# Lê os CSVs com o módulo csv, aplica as mesmas normalizações de
+# carregar_csv_padrao/carregar_openalex_csv (valores nulos do pandas,
+# fillna das colunas do OpenAlex), remove repetidos com vinculo e calcula
+# o h5 com metricas. Os números são os mesmos de run_h5_script; com
+# --pandas, usa o próprio calc_h5 (importa pandas).
+#
+# Exemplos:
+#   python3 h5_rapido.py SBPO                   # PACOTE 2025_09, ANO_REF 2025
+#   python3 h5_rapido.py SBPO 2025_09 2024
+#   CSCONFS_LOG=debug python3 h5_rapido.py SBPO # h5 de cada arquivo
+
+# strings que o pandas.read_csv lê como NaN (na_values padrão)
+NULOS = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+         "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+# mesma opção de calc_h5 (liga títulos quase iguais)
+QUASE_DUPLICATAS = os.environ.get("CSCONFS_QUASE_DUPLICATAS", "0") == "1"
+
+def _valor(v):
+    return None if v in NULOS else v
+
+def _inteiro(v):
+    # equivalente a fillna(0).astype(int)
+    v = _valor(v)
+    return 0 if v is None else int(float(v))
+
+def _colunas(caminho):
+    # gera dicionários {coluna: valor}, pulando linhas em branco como o pandas
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        leitor = csv.reader(f)
+        cabecalho = next(leitor, [])
+        for linha in leitor:
+            if not linha:
+                continue
+            yield dict(zip(cabecalho, linha))
+
+# retorna (dois, titulos, citacoes, anos) de um arquivo; None = valor nulo
+def ler_arquivo(caminho):
+    dois, titulos, citacoes, anos = [], [], [], []
+    nome = os.path.basename(caminho)
+    if ".OA." in nome or ".OA-lite." in nome:
+        debug(f"Processando {caminho}... [CSV OpenAlex]")
+        for linha in _colunas(caminho):
+            titulo = _valor(linha["title"])
+            titulos.append(titulo if titulo is not None else _valor(linha["display_name"]))
+            doi = _valor(linha["doi"])
+            dois.append(doi if doi is not None else _valor(linha["ids.doi"]))
+            citacoes.append(_inteiro(linha["cited_by_count"]))
+            anos.append(_inteiro(linha["publication_year"]))
+    else:
+        debug(f"Processando {caminho}... [CSV Padrão]")
+        for linha in _colunas(caminho):
+            titulo = _valor(linha["Title"])
+            titulos.append(titulo if titulo is not None else "")
+            dois.append(_valor(linha.get("DOI", "")))
+            citacoes.append(_inteiro(linha["Cites"]))
+            anos.append(_inteiro(linha["Year"]))
+    return dois, titulos, np.array(citacoes, dtype=np.int64), np.array(anos, dtype=np.int64)
+
+def _primeiro_por_grupo(valores, grupos, num_grupos, vazio):
+    # primeiro valor não vazio de cada grupo (groupby(...).first())
+    saida = [None] * num_grupos
+    for v, g in zip(valores, grupos):
+        if saida[g] is None and v not in vazio:
+            saida[g] = v
+    return saida
+
+# mesmo resultado de calc_h5.remover_repetidos nas colunas usadas pelo h5
+def remover_repetidos(dois, titulos, citacoes, anos):
+    if len(titulos) == 0:
+        return dois, titulos, citacoes, anos
+    grupos = vinculo.agrupar_registros(dois, titulos, QUASE_DUPLICATAS)
+    num_grupos = int(grupos.max()) + 1
+    if num_grupos == len(titulos):
+        return dois, titulos, citacoes, anos
+
+    maximo = np.full(num_grupos, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(maximo, grupos, citacoes)
+    # grupos numerados na ordem da primeira aparição
+    _, primeiro = np.unique(grupos, return_index=True)
+    debug(f"WARNING: removidos {len(titulos)-num_grupos} elementos num_count1={len(titulos)} num_count2={num_grupos}")
+    return (_primeiro_por_grupo(dois, grupos, num_grupos, (None, "")),
+            _primeiro_por_grupo(titulos, grupos, num_grupos, (None,)),
+            maximo, anos[primeiro])
+
+def listar_arquivos(SIGLA, PACOTE):
+    DATA_DIR = f'../data/{SIGLA}/{PACOTE}/'
+    arquivos = sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))
+    fontes = sorted({f for arq in arquivos for f in detectar_fonte(arq)})
+    return arquivos, fontes
+
+# mesmo contrato de calc_h5.run_h5_script:
+# retorna (h5, h5_med, total_citacoes, num_papers, fontes)
+def h5_rapido(ANO_REF, SIGLA, PACOTE):
+    ANO_INICIO = ANO_REF-5
+    ANO_FIM = ANO_REF-1
+    arquivos, fontes = listar_arquivos(SIGLA, PACOTE)
+
+    partes = []
+    with fase("h5_rapido", ano_ref=ANO_REF, sigla=SIGLA, pacote=PACOTE) as f:
+        for arq in arquivos:
+            if arq.endswith(".confseries.csv"):
+                continue
+            dois, titulos, citacoes, anos = remover_repetidos(*ler_arquivo(arq))
+
+            no_periodo = (anos >= ANO_INICIO) & (anos <= ANO_FIM)
+            if not no_periodo.any():
+                debug(f"{arq}: H = 0, Artigos = 0 [ignorado]")
+                continue
+            linhas = np.flatnonzero(no_periodo)
+            partes.append(([dois[i] for i in linhas], [titulos[i] for i in linhas], citacoes[linhas]))
+            h, h_med, total = calcular_metricas_h(citacoes[linhas][citacoes[linhas] > 0])
+            debug(f"{arq}: H = {h}, Hmed = {h_med}, Citacoes = {total}, Artigos = {len(linhas)}")
+
+        if not partes:
+            # run_h5_script falha em pd.concat([])
+            raise ValueError("No objects to concatenate")
+        dois = [d for p in partes for d in p[0]]
+        titulos = [t for p in partes for t in p[1]]
+        citacoes = np.concatenate([p[2] for p in partes])
+        _, _, citacoes, _ = remover_repetidos(dois, titulos, citacoes, np.zeros(len(citacoes), dtype=np.int64))
+        h5_total, h5_med_total, total_citacoes = calcular_metricas_h(citacoes)
+        f.conta(h5=h5_total, linhas=len(citacoes))
+    return h5_total, h5_med_total, total_citacoes, len(citacoes), fontes
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="h5 de um evento, sem pandas")
+    parser.add_argument("sigla")
+    parser.add_argument("pacote", nargs="?", default="2025_09")
+    parser.add_argument("ano_ref", nargs="?", type=int, default=2025)
+    parser.add_argument("--pandas", action="store_true", help="usa calc_h5.run_h5_script (importa pandas)")
+    args = parser.parse_args(argv[1:])
+
+    if args.pandas:
+        import calc_h5
+        resultado = calc_h5.run_h5_script(args.ano_ref, args.sigla, args.pacote)
+    else:
+        resultado = h5_rapido(args.ano_ref, args.sigla, args.pacote)
+    h5_total, h5_med_total, total_citacoes, num_papers_total, fontes = resultado
+    print(f"{args.sigla} {args.pacote} ({args.ano_ref}): H5 = {h5_total}, H5med = {h5_med_total}, "
+          f"Total Citacoes = {total_citacoes}, Total Artigos = {num_papers_total}, Fontes = {'+'.join(fontes)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
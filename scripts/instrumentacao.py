@@ -0,0 +1,104 @@
+import json
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+# Instrumentação dos scripts (calc_h5, generate_website).
+#
+# Nível de log (CSCONFS_LOG): "erro", "info" (padrão) ou "debug".
+# As mensagens por arquivo/por conferência usam debug() e só aparecem em
+# CSCONFS_LOG=debug; os resumos (BEGIN/END, h5 de cada evento) usam info();
+# erros usam erro(), aparecem em qualquer nível e, com CSCONFS_TRACE, também
+# viram uma linha {"fase": "erro", "mensagem": ...} no rastreamento.
+#
+# Rastreamento (CSCONFS_TRACE=<arquivo>): cada fase medida com fase(...)
+# gera uma linha JSON com duração, contadores e memória, por exemplo:
+#   {"ts": ..., "pid": ..., "fase": "dedup", "ms": 12.3, "rss_max_kb": 123456,
+#    "arquivo": "../data/SBPO/2025_09/...csv", "linhas_entrada": 2080, "linhas_saida": 2027}
+# Sem CSCONFS_TRACE, fase(...) devolve um objeto nulo e não mede nada.
+# Vários processos podem escrever no mesmo arquivo (modo append, uma
+# escrita por linha).
+
+NIVEIS = {"erro": 0, "info": 1, "debug": 2}
+NIVEL = NIVEIS.get(os.environ.get("CSCONFS_LOG", "info").lower(), NIVEIS["info"])
+ARQUIVO_TRACE = os.environ.get("CSCONFS_TRACE", "")
+
+_trace = None
+_trace_pid = None
+
+def info(*args, **kwargs):
+    if NIVEL >= NIVEIS["info"]:
+        print(*args, **kwargs)
+
+def debug(*args, **kwargs):
+    if NIVEL >= NIVEIS["debug"]:
+        print(*args, **kwargs)
+
+def erro(*args, **kwargs):
+    print(*args, **kwargs)
+    evento("erro", mensagem=" ".join(str(a) for a in args))
+
+def ativo():
+    return bool(ARQUIVO_TRACE)
+
+def _arquivo_trace():
+    # reabre após fork, para cada processo ter seu próprio descritor
+    global _trace, _trace_pid
+    if _trace is None or _trace_pid != os.getpid():
+        _trace = open(ARQUIVO_TRACE, "a", encoding="utf-8", buffering=1)
+        _trace_pid = os.getpid()
+    return _trace
+
+def memoria():
+    # pico de memória residente do processo, em kB
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def evento(nome, **campos):
+    if not ARQUIVO_TRACE:
+        return
+    registro = {"ts": round(time.time(), 6), "pid": os.getpid(), "fase": nome}
+    registro.update(campos)
+    _arquivo_trace().write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+
+class _Fase:
+    def __init__(self, nome, campos):
+        self.nome = nome
+        self.campos = campos
+
+    def conta(self, **contadores):
+        self.campos.update(contadores)
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        ms = round((time.perf_counter() - self.t0) * 1000, 3)
+        if tipo is not None:
+            self.campos["erro"] = f"{tipo.__name__}: {valor}"
+        evento(self.nome, ms=ms, rss_max_kb=memoria(), **self.campos)
+        return False
+
+class _FaseNula:
+    def conta(self, **contadores):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        return False
+
+_FASE_NULA = _FaseNula()
+
+# uso: with fase("dedup", sigla=SIGLA) as f: ...; f.conta(linhas_saida=len(df))
+def fase(nome, **campos):
+    if not ARQUIVO_TRACE:
+        return _FASE_NULA
+    return _Fase(nome, campos)
@@ -0,0 +1,134 @@
+import numpy as np
+
+# Núcleo numérico do cálculo de h5 (somente NumPy, sem pandas).
+#
+# O h-index é obtido por contagem, sem ordenar as citações:
+# - cada citação é limitada ao número de artigos n (h nunca passa de n)
+# - histograma das citações limitadas, acumulado "de trás pra frente",
+#   dá quantos artigos têm >= i citações
+# - h é o maior i tal que esse total seja >= i
+#
+# Para a mediana do h-core não é preciso ordenar tudo: os artigos com
+# mais de h citações estão todos no h-core (são no máximo h), e as
+# posições restantes do h-core valem exatamente h. Só os artigos com
+# mais de h citações são ordenados (em geral, poucos).
+
+
+def _como_array(citacoes):
+    arr = np.asarray(citacoes)
+    if arr.dtype != np.int64:
+        arr = arr.astype(np.int64)
+    return arr.ravel()
+
+
+def _metricas_h_segmentos(valores, tamanhos):
+    # valores: citações concatenadas de todos os segmentos
+    # tamanhos: quantidade de citações de cada segmento
+    # retorna arrays (h, mediana, total_citacoes), um elemento por segmento
+    num_seg = len(tamanhos)
+    seg = np.repeat(np.arange(num_seg), tamanhos)
+
+    # minimo de 1 citação para contribuir no fator H
+    positivos = valores > 0
+    v = valores[positivos]
+    seg = seg[positivos]
+
+    n = np.bincount(seg, minlength=num_seg)
+    total = np.zeros(num_seg, dtype=np.int64)
+    np.add.at(total, seg, v)
+
+    # cada segmento ocupa n+1 posições (0..n) no histograma global
+    inicio = np.zeros(num_seg, dtype=np.int64)
+    np.cumsum(n[:-1] + 1, out=inicio[1:])
+    tam_hist = int((n + 1).sum())
+    hist = np.bincount(inicio[seg] + np.minimum(v, n[seg]), minlength=tam_hist)
+
+    # ge[i] = artigos do segmento com >= i citações
+    acumulado = np.append(hist[::-1].cumsum()[::-1], 0)
+    seg_pos = np.repeat(np.arange(num_seg), n + 1)
+    i_local = np.arange(tam_hist) - inicio[seg_pos]
+    ge = acumulado[:-1] - acumulado[(inicio + n + 1)[seg_pos]]
+    # ge >= i é verdadeiro num prefixo de cada segmento (i=0 sempre)
+    h = np.add.reduceat((ge >= i_local).astype(np.int64), inicio) - 1
+
+    # artigos acima de h, ordenados por segmento e citações decrescentes
+    acima = v > h[seg]
+    v_acima = v[acima]
+    seg_acima = seg[acima]
+    ordem = np.lexsort((-v_acima, seg_acima))
+    v_acima = np.append(v_acima[ordem], 0)
+    m = np.bincount(seg_acima, minlength=num_seg)
+    inicio_acima = np.zeros(num_seg, dtype=np.int64)
+    np.cumsum(m[:-1], out=inicio_acima[1:])
+
+    def valor_na_posicao(k):
+        # k-ésimo maior valor do h-core (k começa em 0)
+        pos = np.minimum(inicio_acima + k, len(v_acima) - 1)
+        return np.where(k < m, v_acima[pos], h)
+
+    k1 = np.maximum((h - 1) // 2, 0)
+    k2 = h // 2
+    mediana = (valor_na_posicao(k1) + valor_na_posicao(k2)) / 2
+    mediana = np.where(h > 0, mediana, 0)
+
+    return h, mediana, total
+
+
+def _converte_resultado(h, mediana, total):
+    # mantém os tipos de statistics.median: int para h ímpar, float para h par
+    h = int(h)
+    if h == 0:
+        h_med = 0
+    elif h % 2 == 1:
+        h_med = int(mediana)
+    else:
+        h_med = float(mediana)
+    return h, h_med, int(total)
+
+
+# função recebe LISTA/ARRAY DE CITAÇÕES, numérica, e retorna (h, h_mediana, total_citacoes)
+def calcular_metricas_h(citacoes):
+    v = _como_array(citacoes)
+    h, mediana, total = _metricas_h_segmentos(v, np.array([len(v)]))
+    return _converte_resultado(h[0], mediana[0], total[0])
+
+
+# função recebe LISTA DE CITAÇÕES, numérica, e retorna h-index
+def calcular_h_index(citacoes):
+    h, h_med, _ = calcular_metricas_h(citacoes)
+    return h, h_med
+
+
+# versão em lote: recebe várias listas de citações (ex: todos os eventos x anos
+# de referência) e retorna uma lista de (h, h_mediana, total_citacoes), na mesma ordem
+def calcular_metricas_h_lote(lista_citacoes):
+    arrays = [_como_array(c) for c in lista_citacoes]
+    if not arrays:
+        return []
+    tamanhos = np.array([len(a) for a in arrays])
+    h, mediana, total = _metricas_h_segmentos(np.concatenate(arrays), tamanhos)
+    return [_converte_resultado(*r) for r in zip(h, mediana, total)]
+
+
+# fontes de um arquivo de dados, pelo nome (fica aqui para ser usada sem pandas)
+def detectar_fonte(arq):
+    # fontes disponíveis:
+    # OA: OpenAlex
+    # GS: Google Scholar
+    # CR: Crossref
+    # PPXX, onde XX é uma coleta via Publish or Perish do tipo XX
+    # MAXX, onde XX é uma coleta MANUAL do tipo XX
+    #
+    # exemplos: 
+    # - OA: coleta via OpenAlex em formato CSV padrão
+    # - PPCR: coleta do crossref via publish or perish em formato CSV padrão
+    # - MAGS.OA: coleta manual no google scholar em formato CSV OpenAlex
+    #
+    fontes = []
+    if "_PPCR_" in arq:
+        fontes.append("CR")
+    if ".OA." in arq or "_OA_" in arq or "_PPOA_" in arq:
+        fontes.append("OA")
+    if "_PPGS_" in arq or "_MAGS_" in arq:
+        fontes.append("GS")
+    return fontes
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+
+# Response store shared by the providers of fetch_proceedings.py.
+#
+# One SQLite file (STORE_PATH) holds every API response, zlib-compressed JSON,
+# keyed by (provider, normalized DOI, query fields): the same chapter fetched
+# for another venue or on a re-run costs no request. A stored null means the
+# provider has no record for that DOI.
+#
+# Entries older than the TTL (CSCONFS_RESPONSE_TTL_DAYS, default 30; 0 = never)
+# count as misses, since citation counts change; Springer metadata has no
+# citations and never expires (PROVIDER_TTL_DAYS). `compact` drops expired
+# entries and reclaims the space. Hits, misses and writes are added to per-provider counters on close.
+#
+# Usage: python3 response_store.py [status | compact [days] | import <provider> <dir> | clear]
+#   import loads a directory of <doi>.json files (the old springer-get.py cache/).
+
+# same cache folder as cache_csv.CACHE_DIR, without importing pandas into the fetchers
+CACHE_DIR = os.environ.get("CSCONFS_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+STORE_PATH = os.environ.get("CSCONFS_RESPONSE_STORE", os.path.join(CACHE_DIR, "responses.db"))
+TTL_DAYS = float(os.environ.get("CSCONFS_RESPONSE_TTL_DAYS", "30"))
+PROVIDER_TTL_DAYS = {"springer": 0}
+COMPRESSION_LEVEL = 6
+# pending writes are committed every COMMIT_EVERY puts (and on close)
+COMMIT_EVERY = 100
+
+MISS = object()
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS responses (
+           key TEXT PRIMARY KEY,
+           provider TEXT NOT NULL,
+           doi TEXT NOT NULL,
+           fields TEXT NOT NULL,
+           fetched_at REAL NOT NULL,
+           body BLOB NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS idx_responses_fetched_at ON responses(provider, fetched_at)",
+    """CREATE TABLE IF NOT EXISTS counters (
+           provider TEXT NOT NULL,
+           name TEXT NOT NULL,
+           value INTEGER NOT NULL,
+           PRIMARY KEY (provider, name))"""
+]
+
+def normalize_doi(doi):
+    doi = (doi or "").strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "doi:"):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi
+
+def response_key(provider, doi, fields=()):
+    fields = ",".join(sorted(fields))
+    return hashlib.sha1(f"{provider}|{normalize_doi(doi)}|{fields}".encode("utf-8")).hexdigest(), fields
+
+def encode(data):
+    return zlib.compress(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), COMPRESSION_LEVEL)
+
+def decode(body):
+    return json.loads(zlib.decompress(body).decode("utf-8"))
+
+class ResponseStore:
+    def __init__(self, path=STORE_PATH, ttl_days=TTL_DAYS, provider_ttl_days=PROVIDER_TTL_DAYS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_days = ttl_days
+        self.provider_ttl_days = provider_ttl_days
+        # several fetchers (venues) may share the file: WAL lets readers go on while one writes
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+        self.counts = {}
+        self.pending = 0
+
+    def ttl(self, provider):
+        # seconds; 0 = never expires
+        return self.provider_ttl_days.get(provider, self.ttl_days) * 86400
+
+    def count(self, provider, name):
+        self.counts[(provider, name)] = self.counts.get((provider, name), 0) + 1
+
+    def get(self, provider, doi, fields=()):
+        """Stored response (None = no record at the provider), or MISS if absent or expired"""
+        key, _ = response_key(provider, doi, fields)
+        row = self.conn.execute("SELECT fetched_at, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.count(provider, "misses")
+            return MISS
+        ttl = self.ttl(provider)
+        if ttl and time.time() - row[0] > ttl:
+            self.count(provider, "expired")
+            return MISS
+        self.count(provider, "hits")
+        return decode(row[1])
+
+    def put(self, provider, doi, data, fields=(), fetched_at=None):
+        key, fields = response_key(provider, doi, fields)
+        self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                          (key, provider, normalize_doi(doi), fields, fetched_at or time.time(), encode(data)))
+        self.count(provider, "writes")
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        for (provider, name), value in self.counts.items():
+            self.conn.execute("INSERT INTO counters VALUES (?, ?, ?) "
+                              "ON CONFLICT(provider, name) DO UPDATE SET value = value + excluded.value",
+                              (provider, name, value))
+        self.counts = {}
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def summary(self):
+        # session counters, e.g. "openalex: 120 hits, 5 misses"
+        providers = sorted({provider for provider, _ in self.counts})
+        return "; ".join(f"{provider}: {self.counts.get((provider, 'hits'), 0)} hits, "
+                         f"{self.counts.get((provider, 'misses'), 0) + self.counts.get((provider, 'expired'), 0)} misses"
+                         for provider in providers)
+
+    def compact(self, ttl_days=None):
+        """Remove expired entries (or older than ttl_days) and reclaim their space; returns the number removed"""
+        removed = 0
+        providers = [row[0] for row in self.conn.execute("SELECT DISTINCT provider FROM responses")]
+        for provider in providers:
+            ttl = self.ttl(provider) if ttl_days is None else ttl_days * 86400
+            if ttl:
+                removed += self.conn.execute("DELETE FROM responses WHERE provider = ? AND fetched_at < ?",
+                                             (provider, time.time() - ttl)).rowcount
+        self.commit()
+        self.conn.execute("VACUUM")
+        return removed
+
+    def clear(self):
+        removed = self.conn.execute("DELETE FROM responses").rowcount
+        self.commit()
+        self.conn.execute("VACUUM")
+        return removed
+
+    def import_dir(self, provider, directory):
+        # <doi with / and : replaced by _>.json files; the DOI is read from the response
+        # itself and the file mtime is kept as the fetch time
+        imported = 0
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            doi = data.get("query", "").replace("doi:", "", 1) if isinstance(data, dict) else ""
+            if not doi:
+                continue
+            self.put(provider, doi, data, fetched_at=os.path.getmtime(path))
+            imported += 1
+        self.commit()
+        return imported
+
+def status(store):
+    print(f"STORE_PATH = {store.path}")
+    size = sum(os.path.getsize(store.path + suffix) for suffix in ("", "-wal") if os.path.exists(store.path + suffix))
+    print(f"File size = {size/1024/1024:.2f} MB")
+    now = time.time()
+    for provider, entries, stored in store.conn.execute(
+            "SELECT provider, COUNT(*), SUM(LENGTH(body)) FROM responses GROUP BY provider").fetchall():
+        ttl = store.ttl(provider)
+        expired = store.conn.execute("SELECT COUNT(*) FROM responses WHERE provider = ? AND fetched_at < ?",
+                                     (provider, now - ttl if ttl else 0)).fetchone()[0]
+        print(f"  {provider}: {entries} entries, {stored/1024:.0f} KB compressed, "
+              f"TTL = {f'{ttl/86400:g} days' if ttl else 'never'}, {expired} expired")
+    for provider, name, value in store.conn.execute("SELECT provider, name, value FROM counters ORDER BY provider, name"):
+        print(f"  {provider} {name} = {value}")
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else "status"
+    with ResponseStore() as store:
+        if command == "status":
+            status(store)
+        elif command == "compact":
+            removed = store.compact(float(argv[2]) if len(argv) > 2 else None)
+            print(f"Removed {removed} expired entries")
+        elif command == "import" and len(argv) == 4:
+            print(f"Imported {store.import_dir(argv[2], argv[3])} responses")
+        elif command == "clear":
+            removed = store.clear()
+            print(f"Removed {removed} entries")
+        else:
+            print(f"Usage: python3 {os.path.basename(argv[0])} [status | compact [days] | import <provider> <dir> | clear]")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,41 @@
+import vinculo
+
+# Uso: cd scripts && python3 -m pytest -q test_vinculo.py
+
+
+def test_titulo_nao_latino_repetido_e_unido():
+    grupos = vinculo.agrupar_registros([None, None, None], ["数据挖掘研究", "数据挖掘研究", "图神经网络"])
+    assert list(grupos) == [0, 0, 1]
+
+
+def test_titulo_nao_latino_normalizado():
+    assert vinculo.normalizar_titulo("数据挖掘研究") == "数据挖掘研究"
+    assert vinculo.normalizar_titulo("Ｇｒａｆｏｓ: 第3章") == "grafos 3"
+    assert vinculo.normalizar_titulo("第3章") == "第3章"
+    assert vinculo.normalizar_titulo("Otimização Híbrida") == "otimizacao hibrida"
+
+
+def test_quase_duplicatas_com_numeros_diferentes_ficam_separados():
+    base = "A very long synthetic title about combinatorial optimization, number "
+    titulos = [base + str(i) for i in range(10, 40)]
+    grupos = vinculo.agrupar_registros([None] * len(titulos), titulos, quase_duplicatas=True)
+    assert len(set(grupos)) == len(titulos)
+
+
+def test_quase_duplicatas_unidas():
+    titulos = ["A Hybrid Metaheuristic for the Vehicle Routing Problem with Time Windows",
+               "A Hybrid Metaheuristic for the Vehicle Routing Problem with Time-Windows.",
+               "A Hybrid Metaheuristic for the Vehicle Routing Problem with Time Window",
+               "Scheduling with Setup Times"]
+    grupos = vinculo.agrupar_registros([None] * len(titulos), titulos, quase_duplicatas=True)
+    assert list(grupos) == [0, 0, 0, 1]
+
+
+def test_assinaturas_em_blocos_iguais_ao_calculo_unico(monkeypatch):
+    conjuntos = {i: vinculo._shingles(f"title {i} about graphs and heuristics") for i in range(50)}
+    linhas = list(conjuntos)
+    a = vinculo.np.arange(1, 64, 2, dtype=vinculo.np.uint64)
+    b = vinculo.np.arange(32, dtype=vinculo.np.uint64)
+    inteiro = vinculo._assinaturas(conjuntos, linhas, a, b)
+    monkeypatch.setattr(vinculo, "BLOCO_ASSINATURAS", 7)
+    assert (vinculo._assinaturas(conjuntos, linhas, a, b) == inteiro).all()
@@ -0,0 +1,186 @@
+import re
+import unicodedata
+import zlib
+import numpy as np
+
+# Vinculação de registros (record linkage) de artigos vindos de fontes
+# diferentes (OA, PPCR, PPGS, ...), somente stdlib + NumPy.
+#
+# Dois registros são o mesmo artigo se tiverem:
+# 1. o mesmo DOI normalizado; ou
+# 2. o mesmo título normalizado (sem acentos, caixa, pontuação); títulos
+#    sem nenhuma letra latina (ex: chinês) mantêm a escrita original; ou
+# 3. (opcional) títulos quase iguais: MinHash dos 4-gramas de caracteres com
+#    blocagem LSH, comparando só registros que caem no mesmo balde e que têm
+#    os mesmos números ("Parte 1" e "Parte 2" continuam separados).
+#
+# As ligações formam componentes conexas (transitivas): um artigo com DOI no
+# OA e título ligeiramente diferente no PPCR é unido pelo título a um terceiro
+# registro, e assim por diante. As componentes são resolvidas por propagação
+# de rótulo mínimo em NumPy, em tempo quase linear.
+
+_PREFIXOS_DOI = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+_NAO_ALFANUM = re.compile(r"[^0-9a-z]+")
+_NAO_PALAVRA = re.compile(r"[\W_]+")
+_NUMEROS = re.compile(r"[0-9]+")
+_LETRAS = re.compile(r"[a-z]")
+# letras que não se decompõem em NFKD (ex: "Hı́brido" extraído de PDF)
+_LETRAS_ESPECIAIS = str.maketrans({"ı": "i", "ø": "o", "ł": "l", "đ": "d", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+# parametros do MinHash/LSH: NUM_BANDAS bandas de LINHAS_BANDA hashes
+NUM_BANDAS = 8
+LINHAS_BANDA = 4
+TAM_SHINGLE = 4
+# baldes maiores que isso (ex: "Preface", "Editorial") não geram candidatos
+MAX_BALDE = 50
+# títulos por bloco no cálculo das assinaturas (memória ~ NUM_BANDAS*LINHAS_BANDA*8
+# bytes por 4-grama do bloco)
+BLOCO_ASSINATURAS = 2048
+
+
+def normalizar_doi(doi):
+    if doi is None or doi != doi:  # None ou NaN
+        return ""
+    doi = _PREFIXOS_DOI.sub("", str(doi).strip()).lower()
+    return doi if doi.startswith("10.") else ""
+
+
+def normalizar_titulo(titulo):
+    if titulo is None or titulo != titulo:
+        return ""
+    titulo = str(titulo).casefold()
+    if titulo.isascii():
+        return _NAO_ALFANUM.sub(" ", titulo).strip()
+    # NFKD separa os acentos, que somem na conversão para ASCII
+    ascii_ = unicodedata.normalize("NFKD", titulo.translate(_LETRAS_ESPECIAIS))
+    ascii_ = _NAO_ALFANUM.sub(" ", ascii_.encode("ascii", "ignore").decode("ascii")).strip()
+    if _LETRAS.search(ascii_):
+        return ascii_
+    # sem letras latinas: a conversão para ASCII apagaria o título (ou deixaria só os números)
+    return _NAO_PALAVRA.sub(" ", unicodedata.normalize("NFKC", titulo)).strip()
+
+
+def _ids_por_chave(chaves):
+    # chave -> id inteiro (-1 para chave vazia)
+    ids = {}
+    saida = np.full(len(chaves), -1, dtype=np.int64)
+    for i, chave in enumerate(chaves):
+        if chave:
+            saida[i] = ids.setdefault(chave, len(ids))
+    return saida, len(ids)
+
+
+def _propagar_rotulos(n, relacoes):
+    # relacoes: lista de (linhas, chaves, num_chaves); linhas com a mesma chave ficam no
+    # mesmo grupo. Repete até nenhum rótulo mudar.
+    rotulo = np.arange(n, dtype=np.int64)
+    while True:
+        mudou = False
+        for linhas, chaves, num_chaves in relacoes:
+            if len(linhas) == 0:
+                continue
+            menor = np.full(num_chaves, n, dtype=np.int64)
+            np.minimum.at(menor, chaves, rotulo[linhas])
+            novo = menor[chaves]
+            if (novo < rotulo[linhas]).any():
+                mudou = True
+                np.minimum.at(rotulo, linhas, novo)
+        if not mudou:
+            break
+        # encurta cadeias: rotulo[i] aponta para um representante
+        while True:
+            salto = rotulo[rotulo]
+            if (salto == rotulo).all():
+                break
+            rotulo = salto
+    return rotulo
+
+
+def _shingles(titulo):
+    if len(titulo) <= TAM_SHINGLE:
+        return {zlib.crc32(titulo.encode("utf-8"))}
+    return {zlib.crc32(titulo[i:i + TAM_SHINGLE].encode("utf-8")) for i in range(len(titulo) - TAM_SHINGLE + 1)}
+
+
+def _assinaturas(conjuntos, linhas, a, b):
+    # min dos hashes de cada título, um bloco de títulos por vez: a matriz
+    # hashes x 4-gramas de todo o catálogo não cabe na memória
+    assinaturas = np.empty((len(linhas), len(a)), dtype=np.uint64)
+    for ini in range(0, len(linhas), BLOCO_ASSINATURAS):
+        bloco = linhas[ini:ini + BLOCO_ASSINATURAS]
+        tamanhos = np.array([len(conjuntos[i]) for i in bloco])
+        x = np.fromiter((h for i in bloco for h in conjuntos[i]), dtype=np.uint64, count=int(tamanhos.sum()))
+        inicio = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+        hashes = (np.outer(a, x) + b[:, None]) >> np.uint64(32)
+        assinaturas[ini:ini + len(bloco)] = np.minimum.reduceat(hashes, inicio, axis=1).T
+    return assinaturas
+
+
+def _pares_quase_duplicados(titulos, limiar):
+    num_hashes = NUM_BANDAS * LINHAS_BANDA
+    rng = np.random.default_rng(1234)
+    # hash multiplicativo (a ímpar): bits altos de a*x+b, com estouro de 64 bits
+    a = rng.integers(0, 1 << 63, size=num_hashes, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_hashes, dtype=np.uint64)
+
+    conjuntos = {}
+    linhas = []
+    for i, titulo in enumerate(titulos):
+        if titulo:
+            conjuntos[i] = _shingles(titulo)
+            linhas.append(i)
+    if len(linhas) < 2:
+        return []
+
+    assinaturas = _assinaturas(conjuntos, linhas, a, b)
+    numeros = {i: _NUMEROS.findall(titulos[i]) for i in linhas}
+
+    baldes = {}
+    for i, assinatura in zip(linhas, assinaturas):
+        for banda in range(NUM_BANDAS):
+            chave = (banda, assinatura[banda * LINHAS_BANDA:(banda + 1) * LINHAS_BANDA].tobytes())
+            baldes.setdefault(chave, []).append(i)
+
+    pares = set()
+    for membros in baldes.values():
+        if len(membros) < 2 or len(membros) > MAX_BALDE:
+            continue
+        for p in range(len(membros)):
+            for q in range(p + 1, len(membros)):
+                i, j = membros[p], membros[q]
+                if (i, j) in pares or titulos[i] == titulos[j]:
+                    continue
+                # "Volume 12" e "Volume 13" diferem num único 4-grama, mas são outros artigos
+                if numeros[i] != numeros[j]:
+                    continue
+                si, sj = conjuntos[i], conjuntos[j]
+                if len(si & sj) / len(si | sj) >= limiar:
+                    pares.add((i, j))
+    return sorted(pares)
+
+
+# Agrupa registros pelo DOI, título e (opcionalmente) títulos quase iguais.
+# Retorna um array com o grupo de cada registro, numerados de 0 em diante
+# na ordem da primeira aparição.
+def agrupar_registros(dois, titulos, quase_duplicatas=False, limiar=0.9):
+    dois = [normalizar_doi(d) for d in dois]
+    titulos = [normalizar_titulo(t) for t in titulos]
+    n = len(titulos)
+
+    relacoes = []
+    for chaves in (dois, titulos):
+        ids, num_ids = _ids_por_chave(chaves)
+        validas = np.flatnonzero(ids >= 0)
+        relacoes.append((validas, ids[validas], num_ids))
+
+    if quase_duplicatas:
+        pares = _pares_quase_duplicados(titulos, limiar)
+        if pares:
+            linhas = np.array(pares, dtype=np.int64).ravel()
+            chaves = np.repeat(np.arange(len(pares), dtype=np.int64), 2)
+            relacoes.append((linhas, chaves, len(pares)))
+
+    rotulo = _propagar_rotulos(n, relacoes)
+    _, grupos = np.unique(rotulo, return_inverse=True)
+    # rotulo é o menor índice do grupo, então a ordem já é a da primeira aparição
+    return grupos.astype(np.int64)